@@ -3,9 +3,13 @@
 from .convert import *
 from .correct import *
 from .create import *
+from .parallel import *
+from .pipeline import *
+from .cache import *
 
 from .io import *
 from .util import *
+from .validate import *
 
 # from .correct import cols_to_strip_commas
 # from .correct import cols_to_drop
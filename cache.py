@@ -0,0 +1,184 @@
+import collections
+import functools
+import hashlib
+import os
+import pickle
+import types
+
+import pandas as pd
+
+from .pipeline import _infer_inputs
+
+
+class TransformCache:
+    """Memoize deterministic transform steps keyed by a hash of their input columns and arguments.
+
+    The key combines the function name, the instance state of bound methods like Scaler.transform,
+    the arguments and a vectorized hash of the columns the function reads (values, dtypes and index). The cached value is the set of columns the function
+    created or converted. Results are kept in an in-memory LRU tier limited by bytes and, when a
+    directory is given, in an on-disk tier of pickle files evicted least recently used first.
+
+    Args:
+        max_bytes: Memory budget of the in-memory tier.
+        directory: Directory of the on-disk tier, created when missing. No disk tier when omitted.
+        max_disk_bytes: Size budget of the on-disk tier.
+
+    Example:
+        cache = TransformCache(max_bytes=2 ** 30, directory='.transform_cache')
+        df = cache.call(get_grouped_stats, df, 'store', 'sales')
+        percentile = cache.memoize(cols_to_percentile)
+        df = percentile(df, ['price'])
+        cache.stats()
+    """
+
+    def __init__(self, max_bytes=512 * 2 ** 20, directory=None, max_disk_bytes=4 * 2 ** 30):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = collections.OrderedDict()
+        self._memory_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def call(self, func, df, *args, inputs=None, **kwargs):
+        """Return func(df, *args, **kwargs), reusing a cached result for identical inputs.
+
+        Args:
+            func: Deterministic transform taking a dataframe first, i.e. cols_to_one_hot.
+            df: Pandas dataframe.
+            args: Arguments passed to func after the dataframe.
+            inputs: Optional list of columns func reads. Inferred from args when omitted.
+            kwargs: Keyword arguments passed to func.
+
+        Returns:
+            Dataframe with the columns func creates or converts. A hit honours the inplace keyword
+            like a miss does. Results that remove, rename or reorder columns are returned but never
+            cached, since a hit only writes columns back.
+        """
+
+        inputs = _infer_inputs(args, kwargs, df.columns) if inputs is None else inputs
+        key = self._key(func, df, inputs, args, kwargs)
+
+        columns = self._get(key)
+        if columns is None:
+            self.misses += 1
+            before = list(df.columns)
+            df = func(df, *args, **kwargs)
+            added = [col for col in df.columns if col not in before]
+            if list(df.columns) == before + added:
+                self._put(key, df[[col for col in df.columns if col in added or col in inputs]])
+            return df
+
+        if not kwargs.get('inplace', True):
+            df = df.copy(deep=False)
+        for col in columns.columns:
+            df[col] = columns[col].set_axis(df.index)
+
+        return df
+
+    def memoize(self, func):
+        """Wrap a transform so every call goes through the cache.
+
+        Args:
+            func: Deterministic transform taking a dataframe first.
+
+        Returns:
+            Function with the same arguments as func.
+        """
+
+        @functools.wraps(func)
+        def wrapper(df, *args, **kwargs):
+            return self.call(func, df, *args, **kwargs)
+
+        return wrapper
+
+    def stats(self):
+        """Return hit and miss counters and the size of the in-memory tier."""
+
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'memory_entries': len(self._memory),
+            'memory_bytes': self._memory_bytes,
+        }
+
+    def clear(self):
+        """Empty both tiers and reset the counters."""
+
+        self._memory.clear()
+        self._memory_bytes = 0
+        self.hits = self.disk_hits = self.misses = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _key(self, func, df, inputs, args, kwargs):
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update('{}.{}'.format(func.__module__, func.__qualname__).encode())
+        owner = getattr(func, '__self__', None)
+        if owner is not None and not isinstance(owner, types.ModuleType):
+            # bound methods of fitted encoders depend on their instance state
+            try:
+                digest.update(pickle.dumps(owner, protocol=pickle.HIGHEST_PROTOCOL))
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                raise ValueError('Cannot cache {}, its instance state is not picklable'.format(
+                    func.__qualname__)) from e
+        digest.update(repr(args).encode())
+        digest.update(repr(sorted(kwargs.items())).encode())
+        for col in inputs:
+            digest.update('{}:{}'.format(col, df[col].dtype).encode())
+        if inputs:
+            digest.update(pd.util.hash_pandas_object(df[inputs], index=True).to_numpy().tobytes())
+        else:
+            digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+
+        return digest.hexdigest()
+
+    def _get(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key][0]
+
+        if self.directory is not None:
+            path = os.path.join(self.directory, key + '.pkl')
+            if os.path.isfile(path):
+                columns = pd.read_pickle(path)
+                os.utime(path)
+                self.disk_hits += 1
+                self._remember(key, columns)
+                return columns
+
+        return None
+
+    def _put(self, key, columns):
+        self._remember(key, columns)
+        if self.directory is not None:
+            columns.to_pickle(os.path.join(self.directory, key + '.pkl'))
+            self._evict_disk()
+
+    def _remember(self, key, columns):
+        size = int(columns.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+
+        self._memory[key] = (columns, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+
+    def _evict_disk(self):
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.pkl')]
+        entries = sorted((os.stat(path).st_mtime_ns, os.stat(path).st_size, path) for path in paths)
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
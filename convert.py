@@ -1,118 +1,571 @@
+import re
+import warnings
+
 import pandas as pd
+import numpy as np
+from pandas.tseries.api import guess_datetime_format
+
+
+SLUGIFY = [('[^0-9a-zA-Z]+', '_')]
 
 
-def cols_to_slugify(df, columns):
+def cols_to_slugify(df, columns, inplace=True):
     """Slugify selected column values and return dataframe.
 
     Args: 
         df: Pandas dataframe.
         columns: List of columns to convert.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with converted column data.
     """
 
+    return cols_to_clean_strings(df, columns, SLUGIFY, inplace)
+
+
+def cols_to_clean_strings(df, columns, substitutions, inplace=True):
+    """Apply a list of regex substitutions to selected column values and return dataframe.
+
+    Each column is factorized first, so every distinct string is cleaned only once however often
+    it repeats. Distinct values are cleaned as an Arrow backed string array when pyarrow is installed
+    and the patterns are supported by Arrow, otherwise with precompiled Python regular expressions.
+    Columns with a numeric, boolean or datetime dtype are left untouched, while values that are not
+    strings inside object columns become missing, as with Series.str.replace.
+
+    Args:
+        df: Pandas dataframe.
+        columns: List of columns to convert.
+        substitutions: List of (pattern, replacement) applied in order, i.e. [(',', ''), ('\\s+', ' ')]
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with converted column data.
+    """
+
+    if not inplace:
+        df = df.copy(deep=False)
+
+    compiled = [(re.compile(pattern), replacement) for pattern, replacement in substitutions]
     for col in columns:
-        df[col] = df[col].str.replace('[^0-9a-zA-Z]+', '_', regex=True)
+        if _is_unstringable(df[col].dtype):
+            continue
+        codes, uniques = pd.factorize(df[col])
+        cleaned = _clean_strings(pd.Series(np.asarray(uniques, dtype=object), dtype=object), substitutions, compiled)
+        values = np.append(cleaned.to_numpy(dtype=object, na_value=np.nan), np.nan).take(codes)
+        dtype = df[col].dtype if df[col].dtype == object or pd.api.types.is_string_dtype(df[col].dtype) else object
+        # missing values are kept as they were
+        df[col] = pd.Series(values, index=df.index, dtype=dtype).where(codes >= 0, df[col])
 
     return df
 
 
-def cols_to_float(df, columns):
+def _is_unstringable(dtype):
+    return (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+            or pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype))
+
+
+def _clean_strings(uniques, substitutions, compiled):
+    if pd.api.types.infer_dtype(uniques, skipna=True) in ('string', 'empty'):
+        try:
+            arrow = uniques.astype(pd.StringDtype('pyarrow'))
+            for pattern, replacement in substitutions:
+                arrow = arrow.str.replace(pattern, replacement, regex=True)
+            return arrow
+        except (ImportError, ValueError, TypeError, NotImplementedError):
+            # pyarrow is missing or the pattern uses syntax Arrow's RE2 engine does not support
+            pass
+
+    strings = uniques.map(lambda value: value if isinstance(value, str) else np.nan)
+    for pattern, replacement in compiled:
+        strings = strings.map(lambda value: pattern.sub(replacement, value) if isinstance(value, str) else value)
+
+    return strings
+
+
+def cols_to_float(df, columns, inplace=True):
     """Convert selected column values to float and return dataframe.
 
     Args: 
         df: Pandas dataframe.
         columns: List of columns to convert.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with converted column data.
     """
 
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
         df[col] = df[col].astype(float)
 
     return df
 
 
-def cols_to_int(df, columns):
+def cols_to_int(df, columns, inplace=True):
     """Convert selected column values to int and return dataframe.
 
     Args: 
         df: Pandas dataframe.
         columns: List of columns to convert.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with converted column data.
     """
 
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
         df[col] = df[col].astype(int)
 
     return df
 
 
-def cols_to_datetime(df, columns):
+def cols_to_numeric(df, columns, thousands=',', decimal='.', errors='coerce', downcast=False, inplace=True):
+    """Parse selected columns of dirty numeric strings and return dataframe.
+
+    Replaces chaining cols_to_strip_commas, cols_to_float or cols_to_int and custom parsers, see
+    parse_numeric for the accepted formats.
+
+    Args:
+        df: Pandas dataframe.
+        columns: List of columns to convert.
+        thousands: Thousands separator removed before parsing.
+        decimal: Decimal separator.
+        errors: 'coerce' to set unparseable values to NaN, 'raise' to raise ValueError naming the failed rows.
+        downcast: Use the narrowest signed integer or float type that holds the parsed values, see
+            cols_to_downcast. Parsed strings are float64 otherwise, like cols_to_float.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with converted column data.
+    """
+
+    if not inplace:
+        df = df.copy(deep=False)
+
+    for col in columns:
+        parsed, failed = parse_numeric(df[col], thousands, decimal, downcast)
+        if errors == 'raise' and len(failed):
+            raise ValueError('Column {}: {} values failed to parse, i.e. rows {}'.format(
+                col, len(failed), list(failed[:5])))
+        df[col] = parsed
+
+    return df
+
+
+_CURRENCY_SYMBOLS = '[$\u00a2\u00a3\u00a5\u20ac\u20b9\u20a9\u20bd]'
+
+
+def parse_numeric(series, thousands=',', decimal='.', downcast=False):
+    """Parse a column of dirty numeric strings in one vectorized pass over its distinct values.
+
+    Handles surrounding and inner whitespace, thousands separators, currency symbols, percentages
+    ('12.5%' becomes 0.125), parentheses negatives ('(1,200)' becomes -1200) and trailing minus signs.
+    Blank strings become missing without counting as failures.
+
+    Args:
+        series: Pandas Series of strings or numbers.
+        thousands: Thousands separator removed before parsing.
+        decimal: Decimal separator.
+        downcast: Use the narrowest signed integer or float type that holds the parsed values, see
+            cols_to_downcast. Parsed strings are float64 otherwise, like cols_to_float.
+
+    Returns:
+        Tuple of the parsed Series and an Index of the rows that failed to parse.
+    """
+
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        parsed = series.astype(float) if series.dtype.kind not in 'iuf' else series
+        return _narrowest(parsed) if downcast else parsed, series.index[:0]
+
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(np.asarray(uniques, dtype=object), dtype=object).map(str)
+    text = text.str.replace(_CURRENCY_SYMBOLS, '', regex=True).str.replace(r'\s+', '', regex=True)
+    parentheses = text.str.match(r'^\(.*\)$')
+    text = text.where(~parentheses, text.str[1:-1])
+    percent = text.str.endswith('%')
+    text = text.str.rstrip('%')
+    trailing_minus = text.str.endswith('-') & (text.str.len() > 1)
+    text = text.where(~trailing_minus, text.str[:-1])
+    if thousands:
+        text = text.str.replace(thousands, '', regex=False)
+    if decimal != '.':
+        text = text.str.replace(decimal, '.', regex=False)
+
+    values = pd.to_numeric(text, errors='coerce').to_numpy(dtype=float)
+    values = np.where(parentheses | trailing_minus, -values, values)
+    values = np.where(percent, values / 100, values)
+    blank = (text == '').to_numpy()
+
+    parsed = pd.Series(np.append(values, np.nan).take(codes), index=series.index, name=series.name)
+    failed = series.index[(codes >= 0) & ~np.append(blank, True).take(codes) & parsed.isna().to_numpy()]
+
+    return _narrowest(parsed) if downcast else parsed, failed
+
+
+def _narrowest(series):
+    values = series.to_numpy(dtype=float)
+    if len(values) and np.isfinite(values).all() and (values == np.round(values)).all():
+        series = pd.Series(values.astype(np.int64), index=series.index, name=series.name)
+    frame = cols_to_downcast(pd.DataFrame({'value': series}), ['value'])
+
+    return frame['value'].rename(series.name)
+
+
+def cols_to_datetime(df, columns, date_format=None, errors='raise', inplace=True):
     """Convert selected column values to datetime and return dataframe.
 
+    String columns are parsed with parse_datetime, which infers one format from a sample and
+    parses each distinct string only once.
+
     Args: 
         df: Pandas dataframe.
         columns: List of columns to convert.
+        date_format: strftime format, or dictionary of column and format. Inferred when omitted.
+        errors: 'raise' to raise ValueError naming the failed rows, 'coerce' to set them to NaT.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with converted column data.
     """
 
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
-        df[col] = pd.to_datetime(df[col])
+        col_format = date_format.get(col) if isinstance(date_format, dict) else date_format
+        parsed, failed = parse_datetime(df[col], col_format)
+        if errors == 'raise' and len(failed):
+            raise ValueError('Column {}: {} values failed to parse, i.e. rows {}'.format(
+                col, len(failed), list(failed[:5])))
+        df[col] = parsed
 
     return df
 
 
-def cols_to_negative(df, columns):
+def infer_datetime_format(series, sample_size=1000, dayfirst=False):
+    """Infer the strftime format parsing the most values of a sample of distinct strings.
+
+    Args:
+        series: Pandas Series of date strings.
+        sample_size: Number of distinct values sampled.
+        dayfirst: Prefer day before month when a value is ambiguous, i.e. 01/02/2020.
+
+    Returns:
+        Format string, or None when no single format parses the sample.
+    """
+
+    sample = pd.Series(series.dropna().unique()[:sample_size]).astype(str)
+    if sample.empty:
+        return None
+
+    candidates = []
+    with warnings.catch_warnings():
+        # probing the other dayfirst setting makes pandas warn for every unambiguous value
+        warnings.simplefilter('ignore', UserWarning)
+        for value in sample[:20]:
+            for first in (dayfirst, not dayfirst):
+                guessed = guess_datetime_format(value, dayfirst=first)
+                if guessed is not None and guessed not in candidates:
+                    candidates.append(guessed)
+
+    best_format, best_parsed = None, 0
+    for candidate in candidates:
+        parsed = _to_datetime(sample, format=candidate).notna().sum()
+        if parsed > best_parsed:
+            best_format, best_parsed = candidate, parsed
+
+    return best_format
+
+
+def parse_datetime(series, date_format=None, sample_size=1000, dayfirst=False):
+    """Parse a column of date strings to datetime, parsing each distinct string once.
+
+    Without a format, one is inferred from a sample with infer_datetime_format and used as a
+    fixed format fast path; values it cannot parse fall back to per value inference.
+
+    Args:
+        series: Pandas Series of date strings, or any values pd.to_datetime accepts.
+        date_format: strftime format. Inferred when omitted.
+        sample_size: Number of distinct values sampled to infer the format.
+        dayfirst: Prefer day before month when inferring an ambiguous format.
+
+    Returns:
+        Tuple of the parsed datetime Series and an Index of the rows that failed to parse.
+    """
+
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series, series.index[:0]
+    if not (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)):
+        return pd.to_datetime(series), series.index[:0]
+
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype=object)
+    date_format = date_format or infer_datetime_format(uniques, sample_size, dayfirst)
+
+    if date_format is not None:
+        parsed = _to_datetime(uniques, format=date_format)
+        unparsed = parsed.isna()
+        if unparsed.any():
+            parsed = _combine_datetimes(parsed[~unparsed], _to_datetime(uniques[unparsed], format='mixed', dayfirst=dayfirst))
+    else:
+        parsed = _to_datetime(uniques, format='mixed', dayfirst=dayfirst)
+
+    result = pd.Series(parsed.array.take(codes, allow_fill=True), index=series.index, name=series.name)
+    failed = series.index[(codes >= 0) & result.isna().to_numpy()]
+
+    return result, failed
+
+
+def _to_datetime(uniques, **kwargs):
+    try:
+        parsed = pd.to_datetime(uniques, errors='coerce', **kwargs)
+    except (ValueError, TypeError):
+        # i.e. naive values mixed with time zones, which have no common dtype
+        parsed = None
+    if parsed is None or not pd.api.types.is_datetime64_any_dtype(parsed.dtype):
+        parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+
+    return parsed
+
+
+def _combine_datetimes(parsed, fallback):
+    combined = pd.concat([parsed, fallback]).sort_index()
+    if pd.api.types.is_datetime64_any_dtype(combined.dtype):
+        return combined
+
+    # fallback values with another time zone cannot join the fixed format ones, they count as failed
+    return pd.concat([parsed, pd.Series(pd.NaT, index=fallback.index, dtype=parsed.dtype)]).sort_index()
+
+
+def cols_to_negative(df, columns, inplace=True):
     """Convert selected column values to negative and return dataframe.
 
     Args: 
         df: Pandas dataframe.
         columns: List of columns to convert.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with converted column data.
     """
 
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
         df[col] = df[col] * -1
 
     return df
 
 
-def num_to_Cat(df, column, labels, bins):
+def cols_to_downcast(df, columns, inplace=True):
+    """Downcast selected numeric columns to the smallest safe width and return dataframe.
+
+    Signed integers move to the smallest signed type holding their range, never to an unsigned one,
+    so later arithmetic like negation or subtraction cannot wrap around. Unsigned integers stay
+    unsigned. Floats move to float32 only when every value survives the round trip unchanged.
+
+    Args:
+        df: Pandas dataframe.
+        columns: List of columns to convert.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with converted column data.
     """
 
-    :return:
+    if not inplace:
+        df = df.copy(deep=False)
+
+    for col in columns:
+        kind = getattr(df[col].dtype, 'kind', None)
+        if kind in 'iu' and df[col].notna().any():
+            df[col] = pd.to_numeric(df[col], downcast='unsigned' if kind == 'u' else 'integer')
+        elif kind == 'f' and df[col].dtype.itemsize > 4:
+            values = df[col].to_numpy()
+            narrow = values.astype('float32')
+            with np.errstate(over='ignore', invalid='ignore'):
+                if np.array_equal(narrow.astype(values.dtype), values, equal_nan=True):
+                    df[col] = narrow
+
+    return df
+
+
+def cols_to_category(df, columns, max_unique_ratio=0.5, inplace=True):
+    """Convert selected repetitive string columns to category and return dataframe.
+
+    Args:
+        df: Pandas dataframe.
+        columns: List of columns to convert.
+        max_unique_ratio: Largest share of distinct values among rows for a column to be converted.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with converted column data.
     """
-    try:
-        df[column] = pd.cut(df[column], bins=bins, labels=labels)
-    except Exception as e:
-        print("Unexpected error :", e)
-        raise ValueError()
+
+    if not inplace:
+        df = df.copy(deep=False)
+
+    for col in columns:
+        series = df[col]
+        if len(series) and not isinstance(series.dtype, pd.CategoricalDtype) and \
+                (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)):
+            if series.nunique(dropna=False) <= max_unique_ratio * len(series):
+                df[col] = series.astype('category')
+
+    return df
+
+
+def optimize_memory(df, columns=None, max_unique_ratio=0.5, report=False, inplace=True):
+    """Downcast numeric columns and convert repetitive string columns to category.
+
+    Args:
+        df: Pandas dataframe.
+        columns: List of columns to optimize. Defaults to all columns.
+        max_unique_ratio: Largest share of distinct values among rows for a string column to become category.
+        report: Also return a dataframe of dtypes and bytes before and after for each column.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with converted column data, and the report when requested.
+    """
+
+    if not inplace:
+        df = df.copy(deep=False)
+
+    columns = list(df.columns) if columns is None else columns
+    if report:
+        dtypes_before = df[columns].dtypes
+        bytes_before = df[columns].memory_usage(index=False, deep=True)
+
+    cols_to_downcast(df, columns)
+    cols_to_category(df, columns, max_unique_ratio)
+
+    if not report:
+        return df
+
+    bytes_after = df[columns].memory_usage(index=False, deep=True)
+    memory_report = pd.DataFrame({
+        'dtype_before': dtypes_before.astype(str),
+        'dtype_after': df[columns].dtypes.astype(str),
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+    })
+
+    return df, memory_report
+
+
+def num_to_Cat(df, column, labels, bins, inplace=True):
+    """Bin a numeric column into labelled categories and return dataframe, see cols_to_bins.
+
+    Args:
+        df: Pandas dataframe.
+        column: Column to bin.
+        labels: List of labels, one less than the bin edges.
+        bins: List of bin edges or number of equal width bins.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with the categorical column.
+    """
+
+    return cols_to_bins(df, {column: bins}, {column: labels}, inplace=inplace)
+
+
+def cols_to_bins(df, bins, labels=None, right=True, inplace=True):
+    """Bin many numeric columns into categorical columns in one call and return dataframe.
+
+    Args:
+        df: Pandas dataframe.
+        bins: Dictionary of column and bin edges or number of equal width bins, i.e. {'age': [0, 18, 65, 120]}
+        labels: Optional dictionary of column and list of labels. Interval categories when omitted.
+        right: Whether bins include their right edge.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with categorical columns.
+    """
+
+    if not inplace:
+        df = df.copy(deep=False)
+
+    labels = labels or {}
+    for col, edges in bins.items():
+        df[col] = pd.cut(df[col], bins=edges, labels=labels.get(col), right=right)
 
     return df
 
 
-def cat_to_cat(df, column, dict):
+def cat_to_cat(df, column, dict, unmatched='keep', default=None, categorical=False, inplace=True):
+    """Non-exhaustive mapping of a column and return dataframe, see cols_to_map.
+
+    Args:
+        df: Pandas dataframe.
+        column: Column to map.
+        dict: Dictionary of old and new values.
+        unmatched: 'keep' retains values without a mapping, 'default' replaces them with default,
+            'nan' makes them missing.
+        default: Replacement for unmatched values in 'default' mode.
+        categorical: Return a categorical column.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with the mapped column.
     """
-     non-exhaustive mapping : retains the existing variables for non-matches,  add fillna
 
-    :param df:
-    :param column:
-    :param dict:
-    :return:
+    return cols_to_map(df, {column: dict}, unmatched, default, categorical, inplace)
+
+
+def cols_to_map(df, mappings, unmatched='keep', default=None, categorical=True, inplace=True):
+    """Map values of many columns through dictionaries in one call and return dataframe.
+
+    Each dictionary is looked up once per distinct column value, after which the column is
+    mapped with an integer take over its factorized codes, so large dictionaries and long
+    columns stay cheap. Missing values stay missing.
+
+    Args:
+        df: Pandas dataframe.
+        mappings: Dictionary of column and dictionary of old and new values, i.e. {'state': {'NY': 'New York'}}
+        unmatched: 'keep' retains values without a mapping, 'default' replaces them with default,
+            'nan' makes them missing.
+        default: Replacement for unmatched values in 'default' mode.
+        categorical: Return categorical columns, which saves memory for repeated values.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with mapped columns.
     """
-    try:
-        df[column] = df[column].map(dict)
-    except Exception as e:
-        print("Unexpected error :", e)
-        raise ValueError()
+
+    if not inplace:
+        df = df.copy(deep=False)
+
+    if unmatched not in ('keep', 'default', 'nan'):
+        raise ValueError('Unknown unmatched mode: {}'.format(unmatched))
+
+    for col, mapping in mappings.items():
+        codes, uniques = pd.factorize(df[col])
+        uniques = np.asarray(uniques, dtype=object)
+        positions = pd.Index(list(mapping.keys()), dtype=object).get_indexer(uniques)
+        values = np.asarray(list(mapping.values()) + [None], dtype=object)[positions]
+
+        if unmatched == 'keep':
+            values = np.where(positions >= 0, values, uniques)
+        elif unmatched == 'default':
+            values = np.where(positions >= 0, values, default)
+        else:
+            values = np.where(positions >= 0, values, np.nan)
+
+        if categorical:
+            value_codes, categories = pd.factorize(values)
+            df[col] = pd.Categorical.from_codes(np.append(value_codes, -1).take(codes), categories)
+        else:
+            df[col] = pd.Series(np.append(values, np.nan).take(codes), index=df.index).infer_objects()
 
     return df
@@ -1,34 +1,41 @@
 import pandas as pd 
 
+from .convert import cols_to_clean_strings
 
-def cols_to_strip_commas(df, columns):
+
+STRIP_COMMAS = [(',', '')]
+
+
+def cols_to_strip_commas(df, columns, inplace=True):
     """Strip commas from selected dataframe columns.
 
     Args: 
         df: Pandas dataframe.
         columns: List of columns to convert.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with converted column data.
     """
 
-    for col in columns:
-        df[col] = df[col].str.replace(',','')
-        
-    return df
+    return cols_to_clean_strings(df, columns, STRIP_COMMAS, inplace)
 
 
-def cols_to_drop(df, columns):
+def cols_to_drop(df, columns, inplace=True):
     """Drop selected columns and return dataframe.
 
     Args: 
         df: Pandas dataframe.
         columns: List of columns to drop.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe without dropped columns.
     """
 
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
         df.drop([col], axis=1, inplace=True) 
 
@@ -36,29 +43,35 @@ def cols_to_drop(df, columns):
 
 
 def col_names_to_lower(df):
-    """Convert column names to lowercase and return dataframe.
+    """Return the column names converted to lowercase, i.e. df.columns = col_names_to_lower(df).
+
+    The dataframe itself is never modified, so unlike the other transforms there is no inplace argument.
 
     Args: 
         df: Pandas dataframe.
 
     Returns: 
-        Original dataframe with converted column data.
+        Index of lowercase column names.
     """
 
     return df.columns.str.lower()
 
 
-def cols_to_rename(df, dictionary):
+def cols_to_rename(df, dictionary, inplace=True):
     """Drop selected columns and return dataframe.
     
     Args: 
         df: Pandas dataframe.
         dictionary: {'old_name1': 'new_name1', 'old_name2': 'new_name2'}
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe without dropped columns.
     """
 
+    if not inplace:
+        df = df.copy(deep=False)
+
     df.rename(dictionary, axis=1, inplace=True)
 
     return df
\ No newline at end of file
@@ -2,7 +2,7 @@ import pandas as pd
 import numpy as np
 
 
-def cols_to_log(df, columns):
+def cols_to_log(df, columns, inplace=True):
     """Transform column data with log and return new columns of prefixed data.
 
     For us with data where the column values do not include zeroes.
@@ -10,18 +10,22 @@ def cols_to_log(df, columns):
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
 
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
         df['log_'+col] = np.log(df[col])
 
     return df
 
 
-def cols_to_log1p(df, columns):
+def cols_to_log1p(df, columns, inplace=True):
     """Transform column data with log+1 and return new columns of prefixed data. 
     
     For use with data where the column values include zeroes. 
@@ -29,18 +33,22 @@ def cols_to_log1p(df, columns):
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
 
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
         df['log1p_'+col] = np.log(df[col]+1)
 
     return df
 
 
-def cols_to_log_max_root(df, columns):
+def cols_to_log_max_root(df, columns, inplace=True):
     """Convert data points to log values using the maximum value as the log max and return new columns of prefixed data. 
     
     For use with data where the column values include zeroes. 
@@ -48,46 +56,51 @@ def cols_to_log_max_root(df, columns):
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
 
-    for col in columns:
-        log_max = np.log(df[col].max())
-        df['logmr_'+col] = df[col] ** (1 / log_max)
-
-    return df
+    return Scaler('log_max_root').fit_transform(df, columns, inplace)
 
 
-def cols_to_tanh(df, columns):
+def cols_to_tanh(df, columns, inplace=True):
     """Transform column data with hyperbolic tangent and return new columns of prefixed data. 
     
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
 
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
         df['tanh_'+col] = np.tanh(df[col])
 
     return df
 
 
-def cols_to_sigmoid(df, columns):
+def cols_to_sigmoid(df, columns, inplace=True):
     """Convert data points to values between 0 and 1 using a sigmoid function and return new columns of prefixed data. 
     
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
     
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
         e = np.exp(1)
         y = 1 / (1+e**(-df[col]))
@@ -96,73 +109,313 @@ def cols_to_sigmoid(df, columns):
     return df
 
 
-def cols_to_cube_root(df, columns):
+def cols_to_cube_root(df, columns, inplace=True):
     """Convert data points to their cube root value so all values are between 0-1 and return new columns of prefixed data. 
     
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
     
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
         df['cube_root_'+col] = df[col] ** (1/3)
 
     return df
 
 
-def cols_to_cube_root_normalize(df, columns):
+def cols_to_cube_root_normalize(df, columns, inplace=True):
     """Convert data points to their normalized cube root value so all values are between 0-1 and return new columns of prefixed data. 
     
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
     
-    for col in columns:
-        df['cube_root_'+col] = (df[col] - df[col].min()) / (df[col].max() - df[col].min()) ** (1/3)
+    return Scaler('cube_root_normalize').fit_transform(df, columns, inplace)
 
-    return df
-
-def cols_to_percentile(df, columns):
+def cols_to_percentile(df, columns, approximate=False, compression=200, inplace=True):
     """Convert data points to their percentile linearized value and return new columns of prefixed data. 
+
+    Values are ranked with ties taking the lowest rank and scaled to 0 for the smallest and 1 for
+    the largest value. The approximate mode uses a PercentileScaler instead of a full ranking.
     
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        approximate: Use a quantile sketch instead of exact ranks.
+        compression: Sketch compression for the approximate mode.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
+    if approximate:
+        return PercentileScaler(compression).fit_transform(df, columns, inplace)
+
+    if not inplace:
+        df = df.copy(deep=False)
+
     for col in columns:
-        df['pc_lin_'+col] = df[col].rank(method='min').apply(lambda x: (x-1) / len(df[col])-1)
+        count = df[col].count()
+        df['pc_lin_'+col] = (df[col].rank(method='min') - 1) / max(count - 1, 1)
 
     return df
 
 
-def cols_to_normalize(df, columns):
+class QuantileDigest:
+    """Mergeable quantile sketch in the style of t-digest.
+
+    Values are summarised as weighted centroids whose size shrinks towards both tails, so extreme
+    percentiles stay accurate while memory is bounded by roughly the compression parameter. Each
+    centroid also keeps the smallest and largest value it holds, so repeated values stay exact
+    point masses when ranking.
+    Updating and merging are vectorized: centroids are sorted once and grouped by the t-digest
+    scale function instead of being merged one at a time.
+
+    Args:
+        compression: Larger values keep more centroids and give more accurate results.
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.lows = np.empty(0)
+        self.highs = np.empty(0)
+        self.min_ = np.inf
+        self.max_ = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """Add values to the sketch, missing values are ignored.
+
+        Args:
+            values: Array or Series of numbers.
+
+        Returns:
+            The sketch.
+        """
+
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.min_ = min(self.min_, values.min())
+            self.max_ = max(self.max_, values.max())
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(len(values))]),
+                           np.concatenate([self.lows, values]),
+                           np.concatenate([self.highs, values]))
+
+        return self
+
+    def merge(self, other):
+        """Add the centroids of another sketch to this one.
+
+        Args:
+            other: QuantileDigest.
+
+        Returns:
+            The sketch.
+        """
+
+        if len(other.means):
+            self.min_ = min(self.min_, other.min_)
+            self.max_ = max(self.max_, other.max_)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]),
+                           np.concatenate([self.lows, other.lows]),
+                           np.concatenate([self.highs, other.highs]))
+
+        return self
+
+    def cdf(self, values):
+        """Return the approximate fraction of sketched values below each value, between 0 and 1."""
+
+        return self.rank(values) / self.count
+
+    def rank(self, values):
+        """Return the approximate number of sketched values strictly below each value.
+
+        Centroids holding a single distinct value count as a point mass, other centroids spread
+        their weight evenly between their smallest and largest value. Missing values stay missing.
+        """
+
+        if not len(self.means):
+            raise ValueError('QuantileDigest is empty')
+
+        # every centroid adds its weight between its low and high value, ties resolve to the lower end
+        xs = np.maximum.accumulate(np.column_stack([self.lows, self.highs]).ravel())
+        below = np.cumsum(self.weights) - self.weights
+        ys = np.column_stack([below, below + self.weights]).ravel()
+
+        values = np.asarray(values, dtype=float)
+        right = np.clip(np.searchsorted(xs, values, side='left'), 1, len(xs) - 1)
+        left = right - 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = np.clip((values - xs[left]) / (xs[right] - xs[left]), 0, 1)
+        ranks = ys[left] + np.nan_to_num(share) * (ys[right] - ys[left])
+        ranks = np.where(values <= xs[0], 0.0, ranks)
+        ranks = np.where(values > xs[-1], self.count, ranks)
+
+        return np.where(np.isnan(values), np.nan, ranks)
+
+    def quantile(self, q):
+        """Return the approximate value at each quantile q between 0 and 1."""
+
+        xs, ys = self._curve()
+
+        return np.interp(np.asarray(q, dtype=float), ys, xs)
+
+    def _curve(self):
+        if not len(self.means):
+            raise ValueError('QuantileDigest is empty')
+
+        centres = (np.cumsum(self.weights) - self.weights / 2) / self.count
+
+        return np.r_[self.min_, self.means, self.max_], np.r_[0.0, centres, 1.0]
+
+    def _compress(self, means, weights, lows, highs):
+        order = np.argsort(means, kind='stable')
+        means, weights, lows, highs = means[order], weights[order], lows[order], highs[order]
+
+        # runs of one repeated value collapse into a single centroid first, and ties heavier than
+        # 1 / compression of the total keep a centroid of their own, so they rank exactly
+        pure = lows == highs
+        tied = pure[1:] & pure[:-1] & (means[1:] == means[:-1])
+        means, weights, lows, highs = self._reduce(np.flatnonzero(np.r_[True, ~tied]), means, weights, lows, highs)
+        heavy = (lows == highs) & (weights * self.compression >= weights.sum())
+
+        centres = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * centres - 1))
+        starts = np.flatnonzero(np.r_[True, (k[1:] != k[:-1]) | heavy[1:] | heavy[:-1]])
+        self.means, self.weights, self.lows, self.highs = self._reduce(starts, means, weights, lows, highs)
+
+    def _reduce(self, starts, means, weights, lows, highs):
+        total = np.add.reduceat(weights, starts)
+
+        return (np.add.reduceat(means * weights, starts) / total, total,
+                np.minimum.reduceat(lows, starts), np.maximum.reduceat(highs, starts))
+
+
+class PercentileScaler:
+    """Learn approximate column percentiles over a stream and apply them to new data.
+
+    Each column is summarised by a QuantileDigest, so chunks can be fitted with partial_fit without
+    keeping the full column, and transform maps values to their percentile between 0 and 1.
+
+    Args:
+        compression: Compression of each column's QuantileDigest.
+
+    Example:
+        scaler = PercentileScaler()
+        for chunk in read_csv(file, chunksize=100000):
+            scaler.partial_fit(chunk, ['price'])
+        df = scaler.transform(df)
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.digests_ = {}
+
+    def fit(self, df, columns):
+        """Sketch selected columns, replacing any previous fit.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit.
+
+        Returns:
+            The fitted scaler.
+        """
+
+        self.digests_ = {}
+
+        return self.partial_fit(df, columns)
+
+    def partial_fit(self, df, columns):
+        """Add another batch of rows to the column sketches.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit.
+
+        Returns:
+            The fitted scaler.
+        """
+
+        for col in columns:
+            self.digests_.setdefault(col, QuantileDigest(self.compression)).update(df[col])
+
+        return self
+
+    def transform(self, df, columns=None, inplace=True):
+        """Convert selected columns to their approximate percentile and return new columns of prefixed data.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to transform. Defaults to all fitted columns.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe with additional prefixed columns.
+        """
+
+        if not inplace:
+            df = df.copy(deep=False)
+
+        columns = list(self.digests_) if columns is None else columns
+        for col in columns:
+            # scaled like the exact mode, the smallest value maps to 0 and the largest to 1
+            digest = self.digests_[col]
+            df['pc_lin_'+col] = np.clip(digest.rank(df[col]) / max(digest.count - 1, 1), 0, 1)
+
+        return df
+
+    def fit_transform(self, df, columns, inplace=True):
+        """Fit selected columns and return the dataframe with new columns of prefixed data.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit and transform.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe with additional prefixed columns.
+        """
+
+        return self.fit(df, columns).transform(df, columns, inplace)
+
+
+def cols_to_normalize(df, columns, inplace=True):
     """Convert data points to values between 0 and 1 and return new columns of prefixed data.
     
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
     
-    for col in columns:
-        df['norm_'+col] = (df[col] - df[col].min()) / (df[col].max() - df[col].min())
-
-    return df
+    return Scaler('normalize').fit_transform(df, columns, inplace)
 
 
-def cols_to_log1p_normalize(df, columns):
+def cols_to_log1p_normalize(df, columns, inplace=True):
     """Transform column data with log+1 normalized and return new columns of prefixed data. 
     
     For use with data where the column values include zeroes. 
@@ -170,79 +423,586 @@ def cols_to_log1p_normalize(df, columns):
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
 
-    for col in columns:
-        df['log1p_norm_'+col] = np.log((df[col] - df[col].min()) / (df[col].max() - df[col].min())+1)
+    return Scaler('log1p_normalize').fit_transform(df, columns, inplace)
 
-    return df
 
+_SCALE_METHODS = {
+    'normalize': ('norm_', lambda x, lo, hi: (x - lo) / (hi - lo)),
+    'cube_root_normalize': ('cube_root_', lambda x, lo, hi: (x - lo) / (hi - lo) ** (1/3)),
+    'log1p_normalize': ('log1p_norm_', lambda x, lo, hi: np.log((x - lo) / (hi - lo) + 1)),
+    'log_max_root': ('logmr_', lambda x, lo, hi: x ** (1 / np.log(hi))),
+}
+
+
+class Scaler:
+    """Fit column minimum and maximum once and apply a normalization to many batches.
+
+    Uses the same formulas and column prefixes as cols_to_normalize, cols_to_cube_root_normalize,
+    cols_to_log1p_normalize and cols_to_log_max_root, but the statistics are learned with fit or
+    partial_fit and reused by transform, so new batches are scaled consistently with training data.
+
+    Args:
+        method: One of 'normalize', 'cube_root_normalize', 'log1p_normalize' or 'log_max_root'.
+
+    Example:
+        scaler = Scaler('normalize')
+        for chunk in read_csv(file, chunksize=100000):
+            scaler.partial_fit(chunk, ['price'])
+        df = scaler.transform(df)
+    """
+
+    def __init__(self, method='normalize'):
+        if method not in _SCALE_METHODS:
+            raise ValueError('Unknown scaling method: {}'.format(method))
+
+        self.method = method
+        self.min_ = None
+        self.max_ = None
+        self.n_samples_ = 0
+
+    def fit(self, df, columns):
+        """Compute the statistics of selected columns, replacing any previous fit.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit.
+
+        Returns:
+            The fitted scaler.
+        """
+
+        self.min_ = None
+        self.max_ = None
+        self.n_samples_ = 0
+
+        return self.partial_fit(df, columns)
+
+    def partial_fit(self, df, columns):
+        """Update the statistics of selected columns with another batch of rows.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit.
+
+        Returns:
+            The fitted scaler.
+        """
+
+        stats = df[columns].agg(['min', 'max'])
+        if self.min_ is None:
+            self.min_ = stats.loc['min']
+            self.max_ = stats.loc['max']
+        else:
+            self.min_ = np.fmin(self.min_.reindex(stats.columns), stats.loc['min']).combine_first(self.min_)
+            self.max_ = np.fmax(self.max_.reindex(stats.columns), stats.loc['max']).combine_first(self.max_)
+        self.n_samples_ += len(df)
 
-def cols_to_one_hot(df, columns):
+        return self
+
+    def transform(self, df, columns=None, inplace=True):
+        """Scale selected columns with the fitted statistics and return new columns of prefixed data.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to transform. Defaults to all fitted columns.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe with additional prefixed columns.
+        """
+
+        if not inplace:
+            df = df.copy(deep=False)
+
+        if self.min_ is None:
+            raise ValueError('Scaler has not been fitted')
+
+        columns = list(self.min_.index) if columns is None else columns
+        prefix, formula = _SCALE_METHODS[self.method]
+        scaled = formula(df[columns], self.min_[columns], self.max_[columns])
+        df[[prefix + col for col in columns]] = scaled.to_numpy()
+
+        return df
+
+    def fit_transform(self, df, columns, inplace=True):
+        """Fit selected columns and return the dataframe with new columns of prefixed data.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit and transform.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe with additional prefixed columns.
+        """
+
+        return self.fit(df, columns).transform(df, columns, inplace)
+
+    def to_dict(self):
+        """Return the fitted state as a JSON serializable dictionary."""
+
+        return {
+            'method': self.method,
+            'min': {} if self.min_ is None else self.min_.to_dict(),
+            'max': {} if self.max_ is None else self.max_.to_dict(),
+            'n_samples': self.n_samples_,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Restore a scaler from the output of to_dict."""
+
+        scaler = cls(state['method'])
+        if state['min']:
+            scaler.min_ = pd.Series(state['min'], dtype=float)
+            scaler.max_ = pd.Series(state['max'], dtype=float)
+        scaler.n_samples_ = state['n_samples']
+
+        return scaler
+
+
+def cols_to_one_hot(df, columns, sparse=False, inplace=True):
     """One hot encode column values and return new prefixed columns.
     
     Args: 
         df: Pandas dataframe.
         columns: List of columns to transform.
+        sparse: Return the encoded columns as pandas sparse columns.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns: 
         Original dataframe with additional prefixed columns.
     """
-    
-    for col in columns:
-        encoding = pd.get_dummies(df[col], prefix=col)
-        df = pd.concat([df, encoding], axis=1)
-        
-    return df
 
+    return OneHotEncoder(sparse=sparse).fit_transform(df, columns, inplace)
+
+
+class OneHotEncoder:
+    """Learn the category vocabulary of columns once and one hot encode many batches consistently.
+
+    Encoded columns are named like pd.get_dummies, i.e. 'colour_red'. Values not seen while fitting
+    and missing values encode as all False, so scoring data always gets the same columns as training
+    data. All encoded columns are built as one block, added to the dataframe with one loc assignment
+    or, when not in place, joined to it in a single concat.
+
+    Args:
+        sparse: Return the encoded columns as pandas sparse columns instead of a dense block.
+
+    Example:
+        encoder = OneHotEncoder()
+        for chunk in read_csv(file, chunksize=100000):
+            encoder.partial_fit(chunk, ['colour'])
+        df = encoder.transform(df)
+    """
+
+    def __init__(self, sparse=False):
+        self.sparse = sparse
+        self.categories_ = {}
+
+    def fit(self, df, columns):
+        """Learn the categories of selected columns, replacing any previous fit.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit.
+
+        Returns:
+            The fitted encoder.
+        """
+
+        self.categories_ = {}
+
+        return self.partial_fit(df, columns)
 
-def cols_to_reduce_uniques(df, column_threshold_dict):
+    def partial_fit(self, df, columns):
+        """Add the categories found in another batch of rows to the vocabulary.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit.
+
+        Returns:
+            The fitted encoder.
+        """
+
+        for col in columns:
+            seen = pd.Index(df[col].dropna().unique())
+            if col in self.categories_:
+                seen = self.categories_[col].append(seen).unique()
+            try:
+                seen = seen.sort_values()
+            except TypeError:
+                pass
+            self.categories_[col] = pd.Index(seen)
+
+        return self
+
+    def feature_names(self, columns=None):
+        """Return the names of the encoded columns.
+
+        Args:
+            columns: List of fitted columns. Defaults to all fitted columns.
+
+        Returns:
+            List of column names.
+        """
+
+        columns = list(self.categories_) if columns is None else columns
+
+        return ['{}_{}'.format(col, value) for col in columns for value in self.categories_[col]]
+
+    def transform_csr(self, df, columns=None):
+        """Encode selected columns as a scipy CSR matrix, requires scipy.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of fitted columns. Defaults to all fitted columns.
+
+        Returns:
+            Boolean CSR matrix with one row per dataframe row and one column per feature name.
+        """
+
+        from scipy import sparse
+
+        rows, cols, width = self._positions(df, columns)
+        data = np.ones(len(rows), dtype=bool)
+
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(df), width))
+
+    def transform(self, df, columns=None, inplace=True):
+        """Encode selected columns and return new prefixed columns.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of fitted columns. Defaults to all fitted columns.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe with additional prefixed columns.
+        """
+
+        names = self.feature_names(columns)
+        if self.sparse:
+            encoding = pd.DataFrame.sparse.from_spmatrix(self.transform_csr(df, columns),
+                                                         index=df.index, columns=names)
+        else:
+            rows, cols, width = self._positions(df, columns)
+            # filled column-major so the frame wraps the block without copying it
+            block = np.zeros((width, len(df)), dtype=bool)
+            block[cols, rows] = True
+            encoding = pd.DataFrame(block.T, index=df.index, columns=names, copy=False)
+
+        if not inplace:
+            return pd.concat([df, encoding], axis=1)
+
+        # a single loc assignment adds every encoded column, existing columns keep their buffers
+        df.loc[:, names] = encoding
+
+        return df
+
+    def fit_transform(self, df, columns, inplace=True):
+        """Fit selected columns and return the dataframe with new prefixed columns.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit and transform.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe with additional prefixed columns.
+        """
+
+        return self.fit(df, columns).transform(df, columns, inplace)
+
+    def _positions(self, df, columns):
+        columns = list(self.categories_) if columns is None else columns
+        all_rows, all_cols, offset = [], [], 0
+        for col in columns:
+            categories = self.categories_[col]
+            codes = pd.Categorical(df[col], categories=categories).codes
+            hit = np.flatnonzero(codes >= 0)
+            all_rows.append(hit)
+            all_cols.append(codes[hit].astype(np.intp) + offset)
+            offset += len(categories)
+
+        if not all_rows:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), 0
+
+        return np.concatenate(all_rows), np.concatenate(all_cols), offset
+
+
+def cols_to_reduce_uniques(df, column_threshold_dict, inplace=True):
     """Reduce the number of unique values by creating a column of X values and the rest marked "Others".
     
-    Args: 
+    Args:
         df: Pandas dataframe.
         columns: Dictionary of column and threshold, i.e. {'col1' : 1000, 'col2' : 3000}
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
-    Returns: 
+    Returns:
         Original dataframe with additional prefixed columns. The most dominant values in the column will
         be assigned their original value. The less dominant results will be assigned to Others, which can
         help visualise and model data in some cases.
     """
     
+    if not inplace:
+        df = df.copy(deep=False)
+
     for key, value in column_threshold_dict.items():
-            counts = df[key].value_counts()
-            others = set(counts[counts < value].index)
-            df['reduce_'+key] = df[key].replace(list(others), 'Others')
-            
+        Reducer(threshold=value).fit_transform(df, [key])
+
     return df
 
 
-def get_grouped_stats(df, group, column):
-    """Group by a column and return summary statistics for a given column in new columns.
+class Reducer:
+    """Reduce high cardinality columns to their dominant values or to a fixed number of hash buckets.
+
+    Values are factorized once per column and mapped through a lookup table of the distinct values,
+    so the cost does not grow with the number of rare levels. Output columns are prefixed 'reduce_'.
+
+    Exactly one mode is chosen:
+        threshold: Keep values seen at least this many times, the rest become other.
+        top_k: Keep the k most frequent values, the rest become other.
+        n_buckets: Feature hashing, every value becomes a stable bucket number in range(n_buckets)
+            and missing values become -1. Needs no fitting.
+
+    Counts are exact by default. With capacity set, partial_fit keeps a Misra-Gries heavy hitters
+    summary of at most capacity values per column, so streaming chunks use bounded memory; counts are
+    then underestimated by at most rows / (capacity + 1).
+
+    Args:
+        threshold: Minimum count of kept values.
+        top_k: Number of kept values.
+        n_buckets: Number of hash buckets.
+        capacity: Maximum number of values tracked per column while fitting.
+        other: Replacement for values that are not kept.
+
+    Example:
+        reducer = Reducer(top_k=100, capacity=10000)
+        for chunk in read_csv(file, chunksize=100000):
+            reducer.partial_fit(chunk, ['city'])
+        df = reducer.transform(df)
+    """
+
+    def __init__(self, threshold=None, top_k=None, n_buckets=None, capacity=None, other='Others'):
+        if sum(option is not None for option in (threshold, top_k, n_buckets)) != 1:
+            raise ValueError('Reducer needs exactly one of threshold, top_k or n_buckets')
+
+        self.threshold = threshold
+        self.top_k = top_k
+        self.n_buckets = n_buckets
+        self.capacity = capacity
+        self.other = other
+        self.counts_ = {}
+
+    def fit(self, df, columns):
+        """Count the values of selected columns, replacing any previous fit.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit.
+
+        Returns:
+            The fitted reducer.
+        """
+
+        self.counts_ = {}
+
+        return self.partial_fit(df, columns)
+
+    def partial_fit(self, df, columns):
+        """Add the value counts of another batch of rows.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit.
+
+        Returns:
+            The fitted reducer.
+        """
+
+        if self.n_buckets is not None:
+            return self
+
+        for col in columns:
+            counts = df[col].value_counts(sort=False)
+            if col in self.counts_:
+                counts = self.counts_[col].add(counts, fill_value=0)
+            if self.capacity is not None and len(counts) > self.capacity:
+                # Misra-Gries merge: subtract the (capacity + 1)th largest count and drop what is left at zero
+                cut = np.partition(counts.to_numpy(), len(counts) - self.capacity - 1)[len(counts) - self.capacity - 1]
+                counts = counts - cut
+                counts = counts[counts > 0]
+            self.counts_[col] = counts
+
+        return self
+
+    def kept_values(self, column):
+        """Return the values of a fitted column that are kept.
+
+        Args:
+            column: Fitted column name.
+
+        Returns:
+            Pandas Index of kept values.
+        """
+
+        counts = self.counts_[column]
+        if self.top_k is not None:
+            return counts.sort_values(ascending=False, kind='stable').index[:self.top_k]
+
+        return counts.index[counts.to_numpy() >= self.threshold]
+
+    def transform(self, df, columns=None, inplace=True):
+        """Reduce selected columns and return new columns of prefixed data.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to transform. Defaults to all fitted columns.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe with additional prefixed columns.
+        """
+
+        if not inplace:
+            df = df.copy(deep=False)
+
+        columns = list(self.counts_) if columns is None else columns
+        for col in columns:
+            codes, uniques = pd.factorize(df[col])
+            if self.n_buckets is not None:
+                lookup = (pd.util.hash_array(np.asarray(uniques, dtype=object)) % self.n_buckets).astype(np.int64)
+                df['reduce_'+col] = np.append(lookup, -1).take(codes)
+            else:
+                kept = self.kept_values(col).get_indexer(uniques) >= 0
+                if kept.all():
+                    # nothing is replaced, the source values and dtype are kept as Series.replace does
+                    df['reduce_'+col] = df[col]
+                    continue
+                lookup = np.where(kept, np.asarray(uniques, dtype=object), self.other)
+                dtype = df[col].dtype if pd.api.types.is_string_dtype(df[col].dtype) else object
+                df['reduce_'+col] = pd.Series(np.append(lookup, np.nan).take(codes), index=df.index, dtype=dtype)
+
+        return df
+
+    def fit_transform(self, df, columns, inplace=True):
+        """Fit selected columns and return the dataframe with new columns of prefixed data.
+
+        Args:
+            df: Pandas dataframe.
+            columns: List of columns to fit and transform.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe with additional prefixed columns.
+        """
+
+        return self.fit(df, columns).transform(df, columns, inplace)
+
+
+class GroupPlan:
+    """Factorize group keys once so several grouped computations can reuse the group codes.
 
     Args:
         df: Pandas dataframe.
-        group: Column name to groupby
-        column: Column to summarise.
+        group: Column name or list of column names to group by.
+
+    Example:
+        plan = GroupPlan(df, ['store', 'day'])
+        df = get_grouped_stats(df, ['store', 'day'], ['sales', 'visits'], plan=plan)
+        df = get_grouped_stats(df, ['store', 'day'], 'returns', stats=['sum'], plan=plan)
+    """
+
+    def __init__(self, df, group):
+        self.keys = [group] if isinstance(group, str) else list(group)
+        codes = df.groupby(self.keys, sort=False).ngroup()
+        self.codes = codes.fillna(-1).to_numpy(dtype=np.intp)
+        self.ngroups = int(self.codes.max()) + 1 if len(self.codes) else 0
+        self.has_missing = bool((self.codes < 0).any())
+        self._grouper = np.where(self.codes < 0, np.nan, self.codes) if self.has_missing else self.codes
+
+    def aggregate(self, df, columns, stats):
+        """Compute grouped statistics of selected columns with one row per group.
+
+        Args:
+            df: Pandas dataframe with the same rows the plan was built from.
+            columns: List of columns to summarise.
+            stats: List of aggregation names, i.e. ['mean', 'max'].
+
+        Returns:
+            Dataframe indexed by group code with (column, stat) columns.
+        """
+
+        if len(df) != len(self.codes):
+            raise ValueError('GroupPlan was built for a dataframe with a different number of rows')
+
+        return df[columns].groupby(self._grouper).agg(stats)
+
+    def broadcast(self, values):
+        """Expand one value per group back to one value per row.
+
+        Args:
+            values: Array or Series of per-group values ordered by group code.
+
+        Returns:
+            Numpy array with one value per row, missing group keys receive NaN.
+        """
+
+        values = np.asarray(values)
+        if self.has_missing:
+            values = np.append(values.astype(float), np.nan)
+
+        return values.take(self.codes)
+
+
+def get_grouped_stats(df, group, column, stats=None, plan=None, inplace=True):
+    """Group by one or more columns and return summary statistics for given columns in new columns.
+
+    Group keys are factorized once and all statistics are computed together, then broadcast back to
+    the rows by group code.
+
+    Args:
+        df: Pandas dataframe.
+        group: Column name or list of column names to groupby.
+        column: Column or list of columns to summarise.
+        stats: List of aggregation names. Defaults to mean, median, std, max and min.
+        plan: Optional GroupPlan built for df and group, reused to skip factorizing the keys again.
+            Raises ValueError when it was built for other keys or another number of rows.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns:
-        Original dataframe with new column containing previous value of named column.
+        Original dataframe with new prefixed columns containing the grouped statistics.
 
     """
 
-    df['mean_' + column] = df.groupby([group])[column].transform('mean')
-    df['median_' + column] = df.groupby([group])[column].transform('median')
-    df['std_' + column] = df.groupby([group])[column].transform('std')
-    df['max_' + column] = df.groupby([group])[column].transform('max')
-    df['min_' + column] = df.groupby([group])[column].transform('min')
+    if not inplace:
+        df = df.copy(deep=False)
+
+    columns = [column] if isinstance(column, str) else list(column)
+    stats = ['mean', 'median', 'std', 'max', 'min'] if stats is None else stats
+    keys = [group] if isinstance(group, str) else list(group)
+    if plan is None:
+        plan = GroupPlan(df, keys)
+    elif plan.keys != keys or len(plan.codes) != len(df):
+        raise ValueError('plan was built for group {} over {} rows, not group {} over {} rows'.format(
+            plan.keys, len(plan.codes), keys, len(df)))
+
+    grouped = plan.aggregate(df, columns, stats)
+    for col in columns:
+        for stat in stats:
+            df[stat + '_' + col] = plan.broadcast(grouped[(col, stat)])
 
     return df
 
 
-def get_previous_value(df, group, column, name):
+def get_previous_value(df, group, column, name, inplace=True):
     """Group by a column and return the previous value of another column and assign value to a new column.
 
     Args:
@@ -250,35 +1010,446 @@ def get_previous_value(df, group, column, name):
         group: Column name to groupby
         column: Column value to return.
         name: Name for new column.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns:
         Original dataframe with new column containing previous value of named column.
 
     """
-    df[name] = df.groupby([group])[column].shift().notnull().astype(int)
+    if not inplace:
+        df = df.copy(deep=False)
+
+    lagged = WindowFeatures(group, column, lags=(1,)).transform(df[[group, column]])['lag1_' + column]
+    df[name] = lagged.notnull().astype(int)
     return df
 
 
-def get_dates(df, date_column):
+class WindowFeatures:
+    """Compute group-wise lag, lead, time delta, rolling, expanding and cumulative count features.
+
+    Rows are factorized by group and sorted by group and time once per call, then every requested
+    feature is computed with vectorized passes over the sorted arrays. partial_transform carries the
+    last rows and running totals of every group between calls, so a stream of chunks gives the same
+    results as one call on the whole data, provided each group's rows arrive in time order.
+
+    Features, for each column:
+        lags: 'lag{k}_{column}', value k rows earlier in the group.
+        leads: 'lead{k}_{column}', value k rows later in the group. Not available with partial_transform.
+        rolling: 'roll{w}_{agg}_{column}', aggregate of the last w rows including the current one,
+            agg is one of sum, mean, count, min or max. min and max use O(rows * w) memory.
+        expanding: 'exp_{agg}_{column}', aggregate of all rows so far, same aggs as rolling.
+    And once per call:
+        time_delta: 'delta_{time}', time since the previous row in the group.
+        cumcount: 'cumcount', number of earlier rows in the group.
+
+    Args:
+        group: Column name or list of column names to group by.
+        column: Column or list of columns to compute features of.
+        time: Optional column to order rows by within each group. Row order is kept when omitted.
+        lags: List of lag offsets.
+        leads: List of lead offsets.
+        rolling: Dictionary of window size and aggregates, i.e. {3: ['mean', 'max'], 7: ['sum']}
+        expanding: List of expanding aggregates.
+        time_delta: Add the time since the previous row, requires time.
+        cumcount: Add the cumulative count of rows in the group.
+
+    Example:
+        window = WindowFeatures('session', 'amount', time='ts', lags=[1, 2], rolling={5: ['mean']})
+        for chunk in read_csv(file, chunksize=100000, parse_dates=['ts']):
+            write_csv(window.partial_transform(chunk), file_name='out.csv', mode='a')
+    """
+
+    _AGGREGATES = ('sum', 'mean', 'count', 'min', 'max')
+
+    def __init__(self, group, column, time=None, lags=(1,), leads=(), rolling=None, expanding=(),
+                 time_delta=False, cumcount=False):
+        self.keys = [group] if isinstance(group, str) else list(group)
+        self.columns = [column] if isinstance(column, str) else list(column)
+        self.time = time
+        self.lags = list(lags)
+        self.leads = list(leads)
+        self.rolling = dict(rolling or {})
+        self.expanding = list(expanding)
+        self.time_delta = time_delta
+        self.cumcount = cumcount
+
+        aggregates = set(self.expanding).union(*self.rolling.values())
+        if aggregates - set(self._AGGREGATES):
+            raise ValueError('Unknown aggregates: {}'.format(sorted(aggregates - set(self._AGGREGATES))))
+        if time_delta and time is None:
+            raise ValueError('time_delta requires a time column')
+
+        self.reset()
+
+    def reset(self):
+        """Forget the rows and totals carried between partial_transform calls."""
+
+        self._tail = None
+        self._totals = None
+
+    def transform(self, df, inplace=True):
+        """Compute the features of a whole dataframe and return new prefixed columns.
+
+        Args:
+            df: Pandas dataframe.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe with additional prefixed columns.
+        """
+
+        if not inplace:
+            df = df.copy(deep=False)
+
+        return self._compute(df, carry=False)
+
+    def partial_transform(self, df, inplace=True):
+        """Compute the features of the next chunk of a stream and return new prefixed columns.
+
+        Args:
+            df: Pandas dataframe chunk.
+            inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+        Returns:
+            Original dataframe chunk with additional prefixed columns.
+        """
+
+        if self.leads:
+            raise ValueError('leads need later rows and cannot be computed chunk by chunk')
+
+        if not inplace:
+            df = df.copy(deep=False)
+
+        return self._compute(df, carry=True)
+
+    def _compute(self, df, carry):
+        fields = self.keys + ([self.time] if self.time is not None else []) + self.columns
+        frame = df[fields].reset_index(drop=True)
+        carried = 0
+        if carry and self._tail is not None:
+            carried = len(self._tail)
+            frame = pd.concat([self._tail, frame], ignore_index=True)
+
+        total = len(frame)
+        codes = GroupPlan(frame, self.keys).codes
+        if self.time is not None:
+            order = np.lexsort((frame[self.time].to_numpy(), codes))
+        else:
+            order = np.argsort(codes, kind='stable')
+
+        sorted_codes = codes[order]
+        index = np.arange(total)
+        first = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]] if total else np.zeros(0, dtype=bool)
+        last = np.r_[sorted_codes[1:] != sorted_codes[:-1], True] if total else np.zeros(0, dtype=bool)
+        start = np.maximum.accumulate(np.where(first, index, 0)) if total else index
+        end = np.minimum.accumulate(np.where(last, index, total - 1)[::-1])[::-1] if total else index
+        position = index - start
+        remaining = end - index
+        is_new = order >= carried
+        missing_group = sorted_codes < 0
+        totals = self._carried_totals(frame, codes, order, start) if carry else None
+
+        features = {}
+
+        def add(name, sorted_values):
+            values = pd.Series(sorted_values).where(~missing_group).to_numpy()
+            unsorted = np.empty_like(values)
+            unsorted[order] = values
+            features[name] = unsorted[carried:]
+
+        for col in self.columns:
+            values = pd.Series(frame[col].to_numpy()[order])
+            for k in self.lags:
+                add('lag{}_{}'.format(k, col), values.shift(k).where(position >= k))
+            for k in self.leads:
+                add('lead{}_{}'.format(k, col), values.shift(-k).where(remaining >= k))
+
+            numbers = None
+            if self.rolling or self.expanding:
+                numbers = values.to_numpy(dtype=float, na_value=np.nan)
+
+            for window, aggregates in self.rolling.items():
+                for agg, result in self._rolling(numbers, window, aggregates, index, start, position).items():
+                    add('roll{}_{}_{}'.format(window, agg, col), result)
+
+            if self.expanding:
+                current = np.where(is_new, numbers, np.nan)
+                for agg, result in self._expanding(current, col, sorted_codes, start, totals).items():
+                    add('exp_{}_{}'.format(agg, col), result)
+
+        if self.time_delta:
+            times = pd.Series(frame[self.time].to_numpy()[order])
+            add('delta_{}'.format(self.time), (times - times.shift(1)).where(position >= 1))
+
+        if self.cumcount:
+            seen = np.r_[0, np.cumsum(is_new)]
+            count = seen[index] - seen[start]
+            if totals is not None:
+                count = count + totals['rows'].to_numpy()[sorted_codes]
+            add('cumcount', count)
+
+        if carry:
+            self._carry(frame, codes, order, remaining, carried)
+
+        for name, values in features.items():
+            df[name] = values
+
+        return df
+
+    def _rolling(self, numbers, window, aggregates, index, start, position):
+        present = ~np.isnan(numbers)
+        sums = np.r_[0.0, np.cumsum(np.where(present, numbers, 0.0))]
+        counts = np.r_[0, np.cumsum(present)]
+        low = np.maximum(index - window, start - 1) + 1
+        window_sum = sums[index + 1] - sums[low]
+        window_count = counts[index + 1] - counts[low]
+
+        results = {}
+        for agg in aggregates:
+            if agg == 'sum':
+                results[agg] = np.where(window_count > 0, window_sum, np.nan)
+            elif agg == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    results[agg] = window_sum / window_count
+            elif agg == 'count':
+                results[agg] = window_count
+            else:
+                padded = np.r_[np.full(window - 1, np.nan), numbers]
+                windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+                inside = np.arange(window)[None, :] >= (window - 1 - position)[:, None]
+                reduce = np.fmin.reduce if agg == 'min' else np.fmax.reduce
+                results[agg] = reduce(np.where(inside, windows, np.nan), axis=1)
+
+        return results
+
+    def _expanding(self, numbers, col, sorted_codes, start, totals):
+        present = ~np.isnan(numbers)
+        sums = np.r_[0.0, np.cumsum(np.where(present, numbers, 0.0))]
+        counts = np.r_[0, np.cumsum(present)]
+        index = np.arange(len(numbers))
+        running_sum = sums[index + 1] - sums[start]
+        running_count = counts[index + 1] - counts[start]
+        running_min = running_max = None
+        if 'min' in self.expanding:
+            running_min = self._running_extreme(numbers, sorted_codes, np.inf, 'cummin')
+        if 'max' in self.expanding:
+            running_max = self._running_extreme(numbers, sorted_codes, -np.inf, 'cummax')
+
+        if totals is not None:
+            running_sum = running_sum + totals[col + '_sum'].to_numpy()[sorted_codes]
+            running_count = running_count + totals[col + '_count'].to_numpy()[sorted_codes]
+            if running_min is not None:
+                running_min = np.fmin(running_min, totals[col + '_min'].to_numpy()[sorted_codes])
+            if running_max is not None:
+                running_max = np.fmax(running_max, totals[col + '_max'].to_numpy()[sorted_codes])
+
+        results = {}
+        for agg in self.expanding:
+            if agg == 'sum':
+                results[agg] = np.where(running_count > 0, running_sum, np.nan)
+            elif agg == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    results[agg] = running_sum / running_count
+            elif agg == 'count':
+                results[agg] = running_count
+            elif agg == 'min':
+                results[agg] = running_min
+            else:
+                results[agg] = running_max
+
+        return results
+
+    def _running_extreme(self, numbers, sorted_codes, empty, method):
+        # missing values take the neutral element so the running extreme carries over them
+        filled = pd.Series(np.where(np.isnan(numbers), empty, numbers))
+        running = getattr(filled.groupby(sorted_codes, sort=False), method)().to_numpy()
+
+        return np.where(running == empty, np.nan, running)
+
+    def _group_keys(self, frame, codes):
+        # one row of key values per group code, in code order
+        first_rows = pd.Series(np.arange(len(codes))).groupby(codes).first()
+        first_rows = first_rows[first_rows.index >= 0]
+
+        return pd.MultiIndex.from_frame(frame[self.keys].iloc[first_rows.to_numpy()])
+
+    def _carried_totals(self, frame, codes, order, start):
+        columns = ['rows'] + ['{}_{}'.format(col, stat) for col in self.columns for stat in ('sum', 'count', 'min', 'max')]
+        keys = self._group_keys(frame, codes)
+        if self._totals is None:
+            totals = pd.DataFrame(np.nan, index=keys, columns=columns)
+        else:
+            totals = self._totals.reindex(keys)
+        totals = totals.fillna({col: 0 for col in columns if not col.endswith(('_min', '_max'))})
+        # code -1 (missing keys) reads the last row, an all empty total
+        empty = pd.DataFrame([[0] + [0, 0, np.nan, np.nan] * len(self.columns)], columns=columns)
+
+        return pd.concat([totals.reset_index(drop=True), empty], ignore_index=True)
+
+    def _carry(self, frame, codes, order, remaining, carried):
+        depth = max(self.lags + list(self.rolling) + [1 if self.time_delta else 0] + [0])
+        self._tail = frame.iloc[order[remaining < depth]].reset_index(drop=True) if depth else None
+
+        chunk = frame.iloc[carried:]
+        chunk_codes = codes[carried:]
+        keys = self._group_keys(chunk, chunk_codes)
+        valid = chunk_codes >= 0
+        grouped = chunk[self.columns][valid].groupby(chunk_codes[valid])
+        update = pd.DataFrame(index=keys)
+        update['rows'] = pd.Series(chunk_codes[valid]).value_counts().sort_index().to_numpy()
+        for col in self.columns:
+            stats = grouped[col].agg(['sum', 'count', 'min', 'max'])
+            for stat in ('sum', 'count', 'min', 'max'):
+                update['{}_{}'.format(col, stat)] = stats[stat].to_numpy()
+
+        if self._totals is None:
+            self._totals = update
+            return
+
+        combined = self._totals.reindex(self._totals.index.union(update.index, sort=False))
+        incoming = update.reindex(combined.index)
+        for name in combined.columns:
+            if name.endswith('_min'):
+                combined[name] = np.fmin(combined[name], incoming[name])
+            elif name.endswith('_max'):
+                combined[name] = np.fmax(combined[name], incoming[name])
+            else:
+                combined[name] = combined[name].fillna(0) + incoming[name].fillna(0)
+        self._totals = combined
+
+
+def get_dates(df, date_column, inplace=True):
     """Converts a given date to various formats and returns an updated dataframe.
 
+    The string formats are rendered once per distinct calendar day, see dates_to_strings.
+
     Args:
         df: Pandas dataframe.
-        columns: List of columns to transform.
+        date_column: Datetime column to transform.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
 
     Returns:
         Original dataframe with additional date columns.
     """
 
-    df['day'] = df[date_column].dt.strftime("%d")  # Day of month with leading zero
-    df['month'] = df[date_column].dt.strftime("%m")  # Month of year with leading zero
-    df['year'] = df[date_column].dt.strftime("%Y")  # Full numeric four digit year
-    df['year_month'] = df[date_column].dt.strftime("%Y%m")  # Full numeric four digit year plus month
-    df['week_number'] = df[date_column].dt.strftime("%U")  # Week number with leading zero
-    df['day_number'] = df[date_column].dt.strftime("%j")  # Day number with leading zero
-    df['day_name'] = df[date_column].dt.strftime("%A")  # Day name, i.e. Sunday
-    df['month_name'] = df[date_column].dt.strftime("%B")  # Month name, i.e. January
-    df['mysql_date'] = df[date_column].dt.strftime("%Y-%d-%m")  # MySQL date, i.e. 2020-30-01
+    if not inplace:
+        df = df.copy(deep=False)
+
+    df['day'] = dates_to_strings(df[date_column], "%d")  # Day of month with leading zero
+    df['month'] = dates_to_strings(df[date_column], "%m")  # Month of year with leading zero
+    df['year'] = dates_to_strings(df[date_column], "%Y")  # Full numeric four digit year
+    df['year_month'] = dates_to_strings(df[date_column], "%Y%m")  # Full numeric four digit year plus month
+    df['week_number'] = dates_to_strings(df[date_column], "%U")  # Week number with leading zero
+    df['day_number'] = dates_to_strings(df[date_column], "%j")  # Day number with leading zero
+    df['day_name'] = dates_to_strings(df[date_column], "%A")  # Day name, i.e. Sunday
+    df['month_name'] = dates_to_strings(df[date_column], "%B")  # Month name, i.e. January
+    df['mysql_date'] = dates_to_strings(df[date_column], "%Y-%d-%m")  # MySQL date, i.e. 2020-30-01
 
     return df
 
+
+def dates_to_strings(series, date_format):
+    """Format a datetime column as strings, formatting each distinct calendar day only once.
+
+    Only for formats made of date fields, time of day fields would be rendered as midnight.
+
+    Args:
+        series: Pandas datetime Series.
+        date_format: strftime format, i.e. "%Y-%m-%d".
+
+    Returns:
+        Series of strings, missing dates stay missing.
+    """
+
+    codes, uniques = pd.factorize(series.dt.normalize())
+    rendered = np.append(np.asarray(uniques.strftime(date_format), dtype=object), np.nan)
+
+    return pd.Series(rendered.take(codes), index=series.index)
+
+
+_DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+_MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December']
+_DATE_FEATURES = ['day', 'month', 'year', 'year_month', 'quarter', 'week_number', 'iso_week',
+                  'day_number', 'day_of_week', 'day_name', 'month_name']
+
+
+def get_date_features(df, columns, features=None, inplace=True):
+    """Extract date parts of one or more datetime columns as compact integer and categorical columns.
+
+    Fields are read straight from the datetime values without formatting strings. Integer features
+    use the smallest integer type, or its nullable version when dates are missing. day_name and
+    month_name are ordered categoricals. Use dates_to_strings when string renderings are needed.
+
+    Features:
+        day, month, year, year_month (i.e. 202001), quarter, week_number (Sunday based week like %U),
+        iso_week, day_number (day of year), day_of_week (Monday=0), day_name, month_name.
+
+    Args:
+        df: Pandas dataframe.
+        columns: Datetime column or list of datetime columns to transform.
+        features: List of features to create. Defaults to all features.
+        inplace: Modify and return df, otherwise leave df unchanged and return a shallow copy.
+
+    Returns:
+        Original dataframe with additional columns named column_feature, i.e. created_day.
+    """
+
+    if not inplace:
+        df = df.copy(deep=False)
+
+    columns = [columns] if isinstance(columns, str) else columns
+    features = _DATE_FEATURES if features is None else features
+    unknown = set(features) - set(_DATE_FEATURES)
+    if unknown:
+        raise ValueError('Unknown date features: {}'.format(sorted(unknown)))
+
+    for col in columns:
+        dates = df[col].dt
+        missing = df[col].isna().to_numpy()
+        fields = {}
+
+        def field(name):
+            if name not in fields:
+                if name == 'iso_week':
+                    values = dates.isocalendar().week
+                else:
+                    values = getattr(dates, name)
+                fields[name] = values.to_numpy(dtype=float, na_value=np.nan)
+            return fields[name]
+
+        for feature in features:
+            if feature == 'day_name':
+                codes = np.where(missing, -1, np.nan_to_num(field('dayofweek'), nan=-1)).astype(int)
+                df[col + '_' + feature] = pd.Categorical.from_codes(codes, categories=_DAY_NAMES, ordered=True)
+                continue
+            if feature == 'month_name':
+                codes = np.where(missing, -1, np.nan_to_num(field('month'), nan=0) - 1).astype(int)
+                df[col + '_' + feature] = pd.Categorical.from_codes(codes, categories=_MONTH_NAMES, ordered=True)
+                continue
+
+            if feature == 'year_month':
+                values = field('year') * 100 + field('month')
+            elif feature == 'week_number':
+                # %U: weeks start on Sunday, days before the first Sunday are week 0
+                sunday_weekday = (field('dayofweek') + 1) % 7
+                values = (field('dayofyear') - 1 + 7 - sunday_weekday) // 7
+            elif feature == 'day_number':
+                values = field('dayofyear')
+            elif feature == 'day_of_week':
+                values = field('dayofweek')
+            else:
+                values = field(feature)
+            df[col + '_' + feature] = _compact_integers(values, missing)
+
+    return df
+
+
+def _compact_integers(values, missing):
+    largest = np.nanmax(np.abs(values)) if len(values) and not missing.all() else 0
+    dtype = next(t for t in (np.int8, np.int16, np.int32, np.int64) if largest <= np.iinfo(t).max)
+    integers = np.where(missing, 0, values).astype(dtype)
+    if missing.any():
+        return pd.arrays.IntegerArray(integers, missing)
+
+    return integers
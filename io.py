@@ -1,7 +1,14 @@
+import collections
+import glob
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import pandas as pd
 
+from .convert import optimize_memory, infer_datetime_format, parse_datetime
+
 
 
 
@@ -50,48 +57,174 @@ def read_csv(file, **kwargs):
     """
     read csv
     :param file:    csv file or csv path
-    :param kwargs:  sep:        separator  ','
-                    sheet_name: 'Sheet1' or ['Sheet1', 'Sheet2']
-                    header:     0 or [0, 1]
-                    na_values:  ['NA']
-                    usecols:    2 or 'A,C:E' or ['A', 'C'] or [0, 2, 3]
-                    skiprows:   skip rows
-                    parse_date: ['date_strings'] or {'Date': '%Y-%m-%d'}
-                    converters: {'MyBools': bool}
-                    dtypes:     {'MyInts': 'int64', 'MyText': str}
-    :return: DataFrame
+    :param kwargs:  sep:          separator  ','
+                    sheet_name:   'Sheet1' or ['Sheet1', 'Sheet2']
+                    header:       0 or [0, 1]
+                    na_values:    ['NA']
+                    usecols:      2 or 'A,C:E' or ['A', 'C'] or [0, 2, 3]
+                    skiprows:     skip rows
+                    parse_dates:  ['date_strings'] or {'Date': '%Y-%m-%d'}, parsed with parse_datetime, which
+                                  infers a missing format once and parses each distinct string once.
+                                  values that fail to parse become NaT
+                    converters:   {'MyBools': bool}
+                    dtypes:       {'MyInts': 'int64', 'MyText': str}
+                    chunksize:    rows per chunk, returns an iterator of DataFrames
+                    chunk_memory: bytes per chunk, returns an iterator of DataFrames
+                    optimize:     infer category columns from a sample before reading and downcast
+                                  numeric columns after reading, see optimize_memory
+                    sample_rows:  rows read for the optimize sample pass (10000)
+    :return: DataFrame, or iterator of DataFrame chunks when chunksize/chunk_memory is set
     """
-    sep = kwargs.get('sep', ',')
-    header = kwargs.get('header', 0)
-    na_values = kwargs.get('na_values', ['NA'])
-    usecols = kwargs.get('usecols')
-    parse_dates = kwargs.get('parse_dates')
-    converters = kwargs.get('converters')
-    dtypes = kwargs.get('dtypes')
-
-    csv_df = pd.read_csv(file,
-                         sep=sep,
-                         header=header,
-                         na_values=na_values,
-                         usecols=usecols,
-                         parse_dates=parse_dates,
-                         converters=converters,
-                         dtypes=dtypes,
-                         **kwargs)
+    chunksize = kwargs.pop('chunksize', None)
+    chunk_memory = kwargs.pop('chunk_memory', None)
+    if chunksize is not None or chunk_memory is not None:
+        return iter_csv(file, chunksize=chunksize, chunk_memory=chunk_memory, **kwargs)
+
+    optimize = kwargs.pop('optimize', False)
+    sample_rows = kwargs.pop('sample_rows', 10000)
+    options = _csv_read_options(kwargs)
+    date_formats = _date_formats(options)
+    if optimize:
+        options['dtype'] = _sample_dtypes(pd.read_csv, file, options, sample_rows, exclude=date_formats)
+
+    csv_df = pd.read_csv(file, **options)
+    csv_df = _parse_date_columns(csv_df, date_formats)
+    if optimize:
+        csv_df = optimize_memory(csv_df)
 
     return csv_df
 
 
+def iter_csv(file, chunksize=None, chunk_memory=None, **kwargs):
+    """
+    read csv lazily as DataFrame chunks so peak memory stays bounded
+    :param file:         csv file or csv path
+    :param chunksize:    fixed number of rows per chunk
+    :param chunk_memory: approximate bytes per chunk, rows per chunk are estimated
+                         from the deep memory usage of a first sample chunk
+    :param kwargs:       same as read_csv, plus
+                         sample_rows: rows used to estimate bytes per row and for the optimize sample (1000)
+                         optimize:    read low cardinality string columns as category, inferred from a sample
+    :return: iterator of DataFrame
+    """
+    sample_rows = kwargs.pop('sample_rows', 1000)
+    optimize = kwargs.pop('optimize', False)
+    if chunksize is None and chunk_memory is None:
+        raise ValueError('iter_csv requires chunksize or chunk_memory')
+
+    options = _csv_read_options(kwargs)
+    date_formats = _date_formats(options)
+    if optimize:
+        options['dtype'] = _sample_dtypes(pd.read_csv, file, options, sample_rows, exclude=date_formats)
+
+    reader = pd.read_csv(file, iterator=True, **options)
+    with reader:
+        if chunksize is None:
+            first = _next_chunk(reader, sample_rows)
+            if first is None:
+                return
+            row_bytes = first.memory_usage(index=True, deep=True).sum() / max(len(first), 1)
+            chunksize = max(int(chunk_memory // max(row_bytes, 1)), 1)
+            yield _parse_date_columns(first, date_formats)
+
+        while True:
+            chunk = _next_chunk(reader, chunksize)
+            if chunk is None:
+                return
+            yield _parse_date_columns(chunk, date_formats)
+
+
+def map_chunks(chunks, func, *args, **kwargs):
+    """
+    apply a convert/correct/create transform to each chunk of a chunk iterator
+    :param chunks: iterator of DataFrame, i.e. read_csv(file, chunksize=100000)
+    :param func:   transform taking a DataFrame first, i.e. cols_to_float
+    :param args:   positional arguments passed to func after the chunk
+    :param kwargs: keyword arguments passed to func
+    :return: iterator of transformed DataFrame
+    """
+    for chunk in chunks:
+        yield func(chunk, *args, **kwargs)
+
+
+def _next_chunk(reader, rows):
+    try:
+        chunk = reader.get_chunk(rows)
+    except StopIteration:
+        return None
+
+    return chunk if len(chunk) else None
+
+
+def _sample_dtypes(reader, file, options, sample_rows, exclude=None):
+    """
+    infer read dtypes from the first rows of a file path, low cardinality strings are read as category
+    :return: dtype mapping merged with any dtype given by the caller
+    """
+    dtype = options.get('dtype')
+    if not isinstance(file, (str, os.PathLike)) or not (dtype is None or isinstance(dtype, dict)):
+        return dtype
+
+    sample_options = dict(options, nrows=sample_rows)
+    sample = reader(file, **sample_options)
+    optimized = optimize_memory(sample)
+    inferred = {col: 'category' for col in optimized.columns
+                if isinstance(optimized[col].dtype, pd.CategoricalDtype) and col not in (exclude or {})}
+    inferred.update(dtype or {})
+
+    return inferred
+
+
+def _date_formats(options):
+    """
+    take parse_dates given as column names or {'column': format} out of the read options,
+    those columns are parsed after reading with parse_datetime instead of per value inference
+    :return: {'column': format or None}, formats left as None are inferred from the first data read
+    """
+    parse_dates = options.get('parse_dates')
+    if isinstance(parse_dates, dict) and all(isinstance(value, str) for value in parse_dates.values()):
+        date_formats = dict(parse_dates)
+    elif isinstance(parse_dates, list) and parse_dates and all(isinstance(value, str) for value in parse_dates):
+        date_formats = dict.fromkeys(parse_dates)
+    else:
+        return {}
+
+    options.pop('parse_dates')
+    return date_formats
+
+
+def _parse_date_columns(df, date_formats):
+    for col, date_format in date_formats.items():
+        if date_format is None:
+            # infer once and reuse the format for later chunks
+            date_format = date_formats[col] = infer_datetime_format(df[col])
+        df[col] = parse_datetime(df[col], date_format)[0]
+
+    return df
+
+
+def _csv_read_options(kwargs):
+    options = dict(kwargs)
+    options.setdefault('sep', ',')
+    options.setdefault('header', 0)
+    options.setdefault('na_values', ['NA'])
+    if 'dtypes' in options:
+        options['dtype'] = options.pop('dtypes')
+
+    return options
+
+
 def write_csv(df, **kwargs):
     """
     write csv
-    :param df:
+    :param df:     DataFrame or iterator of DataFrame chunks, chunks are appended incrementally
     :param kwargs: file_name:     file name
                    file_path:     file path
                    sep:           sep
                    path_or_buf:   path or buffer
                    header:        ['A', 'B']
                    index:         index
+                   mode:          'w' to overwrite or 'a' to append
     :return: {
         'file_name': file_name,
         'output_path': output_path
@@ -103,12 +236,19 @@ def write_csv(df, **kwargs):
     sep = kwargs.get('sep', ',')
     header = kwargs.get('header')
     index = kwargs.get('index', False)
-
-    df.to_csv(path_or_buf=output_path,
-              sep=sep,
-              header=header,
-              index=index,
-              encoding='utf-8')
+    mode = kwargs.get('mode', 'w')
+
+    chunks = [df] if isinstance(df, pd.DataFrame) else df
+    for chunk in chunks:
+        chunk.to_csv(path_or_buf=output_path,
+                     sep=sep,
+                     header=header,
+                     index=index,
+                     mode=mode,
+                     encoding='utf-8')
+        # later chunks append to the file without repeating the header
+        header = False
+        mode = 'a'
 
     return {
         'file_name': file_name,
@@ -148,40 +288,91 @@ def re(file):
 def read_excel(file, **kwargs):
     """
     read excel
-    :param file:    excel file or excel path
-    :param kwargs:  sheet_name: 'Sheet1' or ['Sheet1', 'Sheet2']
+    :param file:    excel file, excel path or pd.ExcelFile
+    :param kwargs:  sheet_name: 'Sheet1' or ['Sheet1', 'Sheet2'] or None for all sheets, default first sheet
                     header:     0 or [0, 1]
                     na_values:  ['NA']
                     usecols:    2 or 'A,C:E' or ['A', 'C'] or [0, 2, 3]
                     parse_date: ['date_strings'] or {'Date': '%Y-%m-%d'}
                     converters: {'MyBools': bool}
                     dtypes:     {'MyInts': 'int64', 'MyText': str}
-    :return: DataFrame
+                    optimize:   downcast numeric columns and convert repetitive strings to category
+    :return: DataFrame, or {sheet_name: DataFrame} when sheet_name is a list or None
     """
-    sheet_name = kwargs.get('sheet_name')
-    print(sheet_name)
+    sheet_name = kwargs.get('sheet_name', 0)
     header = kwargs.get('header', 0)
     na_values = kwargs.get('na_values', ['NA'])
     usecols = kwargs.get('usecols')
     parse_dates = kwargs.get('parse_dates')
     converters = kwargs.get('converters')
     dtypes = kwargs.get('dtypes')
+    optimize = kwargs.get('optimize', False)
     # file type(excel file or excel path)
-    new_excel = file if os.path.isfile(file) else pd.ExcelFile(file)
+    if isinstance(file, pd.ExcelFile) or (isinstance(file, (str, os.PathLike)) and os.path.isfile(file)):
+        new_excel = file
+    else:
+        new_excel = pd.ExcelFile(file)
 
     excel_df = pd.read_excel(new_excel,
-                             # sheet_name=sheet_name,
+                             sheet_name=sheet_name,
                              header=header,
                              na_values=na_values,
                              usecols=usecols,
                              parse_dates=parse_dates,
                              converters=converters,
-                             dtypes=dtypes)
-    print(type(excel_df))
+                             dtype=dtypes)
+    if optimize:
+        if isinstance(excel_df, dict):
+            excel_df = {sheet: optimize_memory(sheet_df) for sheet, sheet_df in excel_df.items()}
+        else:
+            excel_df = optimize_memory(excel_df)
 
     return excel_df
 
 
+def read_excel_files(files, **kwargs):
+    """
+    read many workbooks and sheets concurrently, every workbook is opened once and reused for all its sheets
+    :param files:   list of excel paths
+    :param kwargs:  sheet_name: 'Sheet1' or ['Sheet1', 'Sheet2'] or None for all sheets, default first sheet
+                    workers:    number of workers, default number of cpus
+                    backend:    'process' (default, parsing excel is python bound) or 'thread'
+                    concat:     return one DataFrame with source_file and source_sheet columns
+                    other read_excel kwargs are passed to read_excel
+    :return: {(file, sheet name): DataFrame}, or DataFrame when concat is True, sheet positions are resolved to names
+    """
+    sheet_name = kwargs.pop('sheet_name', 0)
+    workers = kwargs.pop('workers', None) or os.cpu_count() or 1
+    backend = kwargs.pop('backend', 'process')
+    concat = kwargs.pop('concat', False)
+    # a single sheet is still returned per workbook as {sheet: DataFrame}
+    sheets = sheet_name if sheet_name is None or isinstance(sheet_name, list) else [sheet_name]
+
+    pool_class = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+    with pool_class(max_workers=min(workers, max(len(files), 1))) as pool:
+        workbooks = list(pool.map(_read_workbook, files, [sheets] * len(files), [kwargs] * len(files)))
+
+    frames = {}
+    for file, workbook in zip(files, workbooks):
+        for sheet, sheet_df in workbook.items():
+            frames[(file, sheet)] = sheet_df
+
+    if not concat:
+        return frames
+
+    tagged = [sheet_df.assign(source_file=file, source_sheet=sheet) for (file, sheet), sheet_df in frames.items()]
+
+    return pd.concat(tagged, ignore_index=True) if tagged else pd.DataFrame()
+
+
+def _read_workbook(file, sheets, options):
+    with pd.ExcelFile(file) as workbook:
+        if sheets is not None:
+            # sheet positions are resolved to names so results are keyed and tagged by the real sheet
+            sheets = [workbook.sheet_names[sheet] if isinstance(sheet, int) else sheet for sheet in sheets]
+        return read_excel(workbook, sheet_name=sheets, **options)
+
+
 def write_excel(df, **kwargs):
     """
     write excel
@@ -215,8 +406,7 @@ def write_excel(df, **kwargs):
                         header=headers[key],
                         sheet_name=sheet,
                         index=index,
-                        merge_cells=merge_cells,
-                        encoding='utf-8')
+                        merge_cells=merge_cells)
 
     return {
         'file_name': file_name,
@@ -224,13 +414,419 @@ def write_excel(df, **kwargs):
     }
 
 
-# TODO split output into another file
-def saveOutputToParquet(df):
-    dataSaved = False
+EXCEL_MAX_ROWS = 1048576
+
+
+def write_excel_sheets(sheets, **kwargs):
+    """
+    write several sheets with xlsxwriter in constant memory mode, rows are streamed to disk in order
+    so the whole workbook is never held in memory. frames longer than the excel row limit continue on
+    extra sheets named 'Sheet1_2', 'Sheet1_3', ...
+    :param sheets: {'Sheet1': DataFrame or iterator of DataFrame chunks, 'Sheet2': ...}
+    :param kwargs: file_name:      file name
+                   file_path:      file path
+                   index:          write the index as the first columns
+                   header_format:  xlsxwriter format for the header row, default {'bold': True}
+                   date_format:    excel number format for dates, default 'yyyy-mm-dd'
+                   max_rows:       rows per sheet including the header, default the excel limit
+    :return: {
+        'file_name': file_name,
+        'output_path': output_path,
+        'sheet_names': ['Sheet1', 'Sheet1_2', 'Sheet2']
+    }
+    """
+    import xlsxwriter
+
+    file_name = kwargs.get('file_name', '')
+    file_path = kwargs.get('file_path', '')
+    output_path = os.path.join(file_path, file_name)
+    index = kwargs.get('index', False)
+    header_format = kwargs.get('header_format', {'bold': True})
+    date_format = kwargs.get('date_format', 'yyyy-mm-dd')
+    max_rows = kwargs.get('max_rows', EXCEL_MAX_ROWS)
+
+    # infinities are written as excel #NUM! errors, xlsxwriter rejects them otherwise
+    workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True,
+                                                 'default_date_format': date_format,
+                                                 'remove_timezone': True,
+                                                 'nan_inf_to_errors': True})
+    bold = workbook.add_format(header_format)
+    sheet_names = []
     try:
-        # save output to parquet
-        df.to_parquet('df.parquet.gzip', compression='gzip')
-    except:
-        print("Unexpected error when saving to parquet:", sys.exc_info()[0])
+        for sheet_name, chunks in sheets.items():
+            chunks = [chunks] if isinstance(chunks, pd.DataFrame) else chunks
+            worksheet, header, row, part = None, None, 0, 0
+            for chunk in chunks:
+                if index:
+                    chunk = chunk.reset_index()
+                if header is None:
+                    header = [str(col) for col in chunk.columns]
+                # missing values are written as blank cells
+                values = chunk.astype(object).where(chunk.notna(), None)
+                for record in values.itertuples(index=False, name=None):
+                    if worksheet is None or row >= max_rows:
+                        part += 1
+                        name = sheet_name if part == 1 else '{}_{}'.format(sheet_name[:31 - len(str(part)) - 1], part)
+                        worksheet = workbook.add_worksheet(name)
+                        sheet_names.append(name)
+                        worksheet.write_row(0, 0, header, bold)
+                        row = 1
+                    worksheet.write_row(row, 0, record)
+                    row += 1
+            if worksheet is None:
+                # empty input still gets a sheet, with a header when columns are known
+                worksheet = workbook.add_worksheet(sheet_name)
+                sheet_names.append(sheet_name)
+                if header is not None:
+                    worksheet.write_row(0, 0, header, bold)
+    finally:
+        workbook.close()
+
+    return {
+        'file_name': file_name,
+        'output_path': output_path,
+        'sheet_names': sheet_names
+    }
+
+
+def read_parquet(file, **kwargs):
+    """
+    read parquet file or partitioned parquet directory
+    :param file:    parquet file or dataset directory
+    :param kwargs:  columns:  ['A', 'B'] only these columns are read
+                    filters:  [('year', '=', 2020), ('amount', '>', 0)] row groups and partitions
+                              that cannot match are skipped
+                    engine:   'pyarrow' or 'fastparquet'
+    :return: DataFrame
+    """
+    columns = kwargs.pop('columns', None)
+    filters = kwargs.pop('filters', None)
+    engine = kwargs.pop('engine', 'pyarrow')
+
+    parquet_df = pd.read_parquet(file, engine=engine, columns=columns, filters=filters, **kwargs)
+
+    return parquet_df
+
+
+def write_parquet(df, **kwargs):
+    """
+    write parquet file or partitioned parquet dataset
+    :param df:
+    :param kwargs: file_name:       file name, or dataset directory name with partition_cols
+                   file_path:       file path
+                   compression:     'snappy', 'gzip', 'brotli', 'zstd', 'lz4' or None
+                   partition_cols:  ['year', 'month'] write one directory per partition value
+                   row_group_size:  rows per row group
+                   index:           index
+                   engine:          'pyarrow' or 'fastparquet'
+    :return: {
+        'file_name': file_name,
+        'output_path': output_path
+    }
+    """
+    file_name = kwargs.pop('file_name', '')
+    file_path = kwargs.pop('file_path', '')
+    output_path = os.path.join(file_path, file_name)
+    compression = kwargs.pop('compression', 'snappy')
+    partition_cols = kwargs.pop('partition_cols', None)
+    index = kwargs.pop('index', False)
+    engine = kwargs.pop('engine', 'pyarrow')
+
+    df.to_parquet(output_path,
+                  engine=engine,
+                  compression=compression,
+                  partition_cols=partition_cols,
+                  index=index,
+                  **kwargs)
+
+    return {
+        'file_name': file_name,
+        'output_path': output_path
+    }
+
+
+def read_feather(file, **kwargs):
+    """
+    read feather (arrow ipc) file
+    :param file:    feather file
+    :param kwargs:  columns:      ['A', 'B'] only these columns are read
+                    use_threads:  decode columns in parallel
+    :return: DataFrame
+    """
+    columns = kwargs.pop('columns', None)
+    use_threads = kwargs.pop('use_threads', True)
+
+    feather_df = pd.read_feather(file, columns=columns, use_threads=use_threads, **kwargs)
+
+    return feather_df
+
+
+def write_feather(df, **kwargs):
+    """
+    write feather (arrow ipc) file
+    :param df:
+    :param kwargs: file_name:    file name
+                   file_path:    file path
+                   compression:  'lz4', 'zstd' or 'uncompressed'
+    :return: {
+        'file_name': file_name,
+        'output_path': output_path
+    }
+    """
+    file_name = kwargs.pop('file_name', '')
+    file_path = kwargs.pop('file_path', '')
+    output_path = os.path.join(file_path, file_name)
+    compression = kwargs.pop('compression', 'lz4')
+
+    # feather stores columns only, a non default index would be lost
+    df.reset_index(drop=True).to_feather(output_path, compression=compression, **kwargs)
+
+    return {
+        'file_name': file_name,
+        'output_path': output_path
+    }
 
 
+def write_mmap(df, **kwargs):
+    """
+    write an uncompressed arrow ipc file with a single record batch, the layout read_mmap can map without copying
+    :param df:
+    :param kwargs: file_name:     file name
+                   file_path:     file path
+    :return: {
+        'file_name': file_name,
+        'output_path': output_path
+    }
+    """
+    file_name = kwargs.get('file_name', '')
+    file_path = kwargs.get('file_path', '')
+    output_path = os.path.join(file_path, file_name)
+
+    # a single record batch keeps every column contiguous, chunked columns are concatenated on read
+    df.reset_index(drop=True).to_feather(output_path, compression='uncompressed', chunksize=max(len(df), 1))
+
+    return {
+        'file_name': file_name,
+        'output_path': output_path
+    }
+
+
+def read_mmap(file, **kwargs):
+    """
+    memory map an arrow ipc / feather file and expose it as a DataFrame without copying,
+    so processes reading the same file share the operating system page cache.
+    columns are only zero copy when the file is uncompressed and holds a single record batch,
+    as written by write_mmap.
+    :param file:    arrow ipc or feather file path
+    :param kwargs:  columns:       ['A', 'B'] only these columns are mapped
+                    arrow_dtypes:  keep every column arrow backed (pd.ArrowDtype), which keeps strings and
+                                   columns with nulls zero copy as well. by default numeric columns without
+                                   nulls are zero copy numpy views and the rest are converted.
+    :return: DataFrame
+    """
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    columns = kwargs.get('columns')
+    arrow_dtypes = kwargs.get('arrow_dtypes', False)
+
+    source = pa.memory_map(file, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+
+    if arrow_dtypes:
+        mmap_df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    else:
+        # one block per column so numeric columns stay views of the mapped buffers
+        mmap_df = table.to_pandas(split_blocks=True)
+
+    return mmap_df
+
+
+def list_files(path, pattern='*'):
+    """
+    expand a glob, a directory or a list of paths into a sorted list of files
+    :param path:    'drops/*.csv' or 'drops/' or ['a.csv', 'b.csv']
+    :param pattern: file pattern used inside a directory, '**/*.csv' searches recursively
+    :return: list of file paths
+    """
+    if isinstance(path, (list, tuple)):
+        return [str(file) for file in path]
+
+    path = str(path)
+    search = os.path.join(path, pattern) if os.path.isdir(path) else path
+
+    return sorted(file for file in glob.glob(search, recursive=True) if os.path.isfile(file))
+
+
+def reconcile_schema(frames):
+    """
+    align DataFrames to the union of their columns with promoted dtypes, i.e. int and float become float
+    :param frames: list of DataFrame
+    :return: list of DataFrame with identical columns and dtypes
+    """
+    schema = pd.concat([frame.head(0) for frame in frames]).dtypes
+
+    return [frame.reindex(columns=schema.index).astype(schema.to_dict(), copy=False) for frame in frames]
+
+
+def read_dataset(path, **kwargs):
+    """
+    read every file of a glob or directory in parallel and combine them into one dataset
+    :param path:    'drops/*.csv' or 'drops/' or ['a.csv', 'b.csv']
+    :param kwargs:  pattern:      file pattern inside a directory, default '*'
+                    reader:       read function, default chosen from the file extension
+                                  (csv, json, parquet, feather, arrow, xls, xlsx, pkl)
+                    workers:      number of threads, default number of cpus
+                    lazy:         yield one DataFrame per file in file order instead of concatenating,
+                                  align them with columns or reconcile_schema
+                    columns:      ['A', 'B'] schema every file is aligned to, missing columns are added empty
+                    source_path:  add a source_path column with the file of each row
+                    source_mtime: add a source_mtime column with the modification time of the file
+                    other kwargs are passed to the reader
+    :return: DataFrame with the union of all columns and promoted dtypes, or iterator of DataFrame when lazy
+    """
+    pattern = kwargs.pop('pattern', '*')
+    files = list_files(path, pattern)
+    lazy = kwargs.pop('lazy', False)
+    frames = _read_files(files, kwargs)
+
+    if lazy:
+        return frames
+
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame()
+
+    # a single concat aligns columns and promotes dtypes across all files
+    return pd.concat(frames, ignore_index=True)
+
+
+def _read_files(files, options):
+    reader = options.pop('reader', None)
+    workers = options.pop('workers', None) or os.cpu_count() or 1
+    columns = options.pop('columns', None)
+    source_path = options.pop('source_path', False)
+    source_mtime = options.pop('source_mtime', False)
+
+    def read(file):
+        file_reader = reader or _READERS[os.path.splitext(file)[1].lower()]
+        frame = file_reader(file, **options)
+        if columns is not None:
+            frame = frame.reindex(columns=columns)
+        if source_path:
+            frame['source_path'] = file
+        if source_mtime:
+            frame['source_mtime'] = pd.Timestamp(os.path.getmtime(file), unit='s')
+        return frame
+
+    # at most workers files are read ahead of the consumer, so lazy reads keep memory bounded
+    with ThreadPoolExecutor(max_workers=min(workers, max(len(files), 1))) as pool:
+        pending = collections.deque()
+        for file in files:
+            pending.append(pool.submit(read, file))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def read_incremental(path, cache_dir, **kwargs):
+    """
+    read a glob or directory through a local cache so only new or modified files are read and transformed.
+    the cache directory holds manifest.json, recording size, mtime and content hash of every input, and
+    one parquet file with the transformed result of each input. files whose size and mtime are unchanged
+    are not opened, files with a changed mtime but identical content are not transformed again, and
+    cached results of deleted inputs are removed.
+    :param path:      'drops/*.csv' or 'drops/' or ['a.csv', 'b.csv']
+    :param cache_dir: directory for the manifest and cached results, created when missing
+    :param kwargs:    pattern:    file pattern inside a directory, default '*'
+                      transform:  function applied to each file's DataFrame before caching, i.e. a Pipeline
+                      key:        version of the transform, changing it invalidates every cached result
+                      other kwargs are passed to read_dataset
+    :return: DataFrame of all inputs in file order
+    """
+    pattern = kwargs.pop('pattern', '*')
+    transform = kwargs.pop('transform', None)
+    key = kwargs.pop('key', '')
+    files = list_files(path, pattern)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+    manifest = {'key': key, 'files': {}}
+    if os.path.isfile(manifest_path):
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+    previous = manifest['files']
+    if manifest.get('key') != key:
+        manifest = {'key': key, 'files': {}}
+
+    entries, changed = {}, []
+    for file in files:
+        stat = os.stat(file)
+        entry = manifest['files'].get(file)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns \
+                and os.path.isfile(os.path.join(cache_dir, entry['output'])):
+            entries[file] = entry
+            continue
+        digest = _file_digest(file)
+        # results are named by path, content and key, identical files keep separate provenance
+        output = hashlib.blake2b('{}\0{}\0{}'.format(file, digest, key).encode(), digest_size=16).hexdigest()
+        entries[file] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'hash': digest,
+                         'output': '{}.parquet'.format(output)}
+        if not (entry and entry['hash'] == digest and os.path.isfile(os.path.join(cache_dir, entry['output']))):
+            changed.append(file)
+
+    if changed:
+        for file, frame in zip(changed, _read_files(changed, kwargs)):
+            if transform is not None:
+                frame = transform(frame)
+            frame.to_parquet(os.path.join(cache_dir, entries[file]['output']), index=None)
+
+    outputs = {entry['output'] for entry in entries.values()}
+    for entry in previous.values():
+        stale = os.path.join(cache_dir, entry['output'])
+        if entry['output'] not in outputs and os.path.isfile(stale):
+            os.remove(stale)
+
+    with open(manifest_path, 'w') as manifest_file:
+        json.dump({'key': key, 'files': entries}, manifest_file, indent=2)
+
+    frames = [pd.read_parquet(os.path.join(cache_dir, entries[file]['output'])) for file in files]
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _file_digest(file, block_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file, 'rb') as content:
+        for block in iter(lambda: content.read(block_size), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def saveOutputToParquet(df):
+    """
+    write df.parquet.gzip in the current directory, kept for backwards compatibility
+    :param df:
+    :return: {
+        'file_name': file_name,
+        'output_path': output_path
+    }
+    """
+    return write_parquet(df, file_name='df.parquet.gzip', compression='gzip')
+
+
+_READERS = {
+    '.csv': read_csv,
+    '.json': read_json,
+    '.parquet': read_parquet,
+    '.feather': read_feather,
+    '.arrow': read_feather,
+    '.xls': read_excel,
+    '.xlsx': read_excel,
+    '.pkl': read_pickle,
+    '.pickle': read_pickle,
+}
@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+def parallel_apply(df, func, columns, *args, backend='thread', workers=None, row_chunks=1, **kwargs):
+    """Run a cols_to_* transform over its columns in a thread or process pool and return dataframe.
+
+    Every column, and optionally every row range of a column, is an independent task. With the
+    process backend numeric columns are copied once into shared memory and workers read them
+    from there instead of receiving a pickled copy.
+
+    Args:
+        df: Pandas dataframe.
+        func: Transform taking (df, columns, ...), i.e. cols_to_tanh.
+        columns: List of columns to transform.
+        args: Further positional arguments passed to func.
+        backend: 'thread' or 'process'. Threads suit numpy transforms that release the GIL,
+            processes suit pure Python work like regex replacement.
+        workers: Number of workers. Defaults to the number of CPUs.
+        row_chunks: Number of row ranges each column is split into. Only use with transforms
+            that work row by row, i.e. cols_to_log or cols_to_slugify, not with transforms
+            using column statistics like cols_to_normalize or cols_to_percentile.
+        kwargs: Keyword arguments passed to func.
+
+    Returns:
+        Original dataframe with converted and additional prefixed columns.
+    """
+
+    if backend not in ('thread', 'process'):
+        raise ValueError('Unknown backend: {}'.format(backend))
+
+    workers = workers or os.cpu_count() or 1
+    bounds = np.linspace(0, len(df), max(row_chunks, 1) + 1).astype(int)
+    ranges = [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start] or [(0, 0)]
+
+    if backend == 'thread':
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_thread_task, df, func, col, start, stop, args, kwargs)
+                       for col in columns for start, stop in ranges]
+            results = [future.result() for future in futures]
+    else:
+        blocks = {}
+        try:
+            specs = {col: _share_column(df[col], blocks) for col in columns}
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_process_task, func, col, _slice_spec(specs[col], start, stop),
+                                       start, stop, args, kwargs)
+                           for col in columns for start, stop in ranges]
+                results = [future.result() for future in futures]
+        finally:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+
+    pieces = {}
+    for result in results:
+        for name, piece in result.items():
+            pieces.setdefault(name, []).append(piece)
+
+    for name, parts in pieces.items():
+        series = parts[0] if len(parts) == 1 else pd.concat(parts)
+        df[name] = series.to_numpy() if backend == 'process' else series
+
+    return df
+
+
+def _thread_task(df, func, col, start, stop, args, kwargs):
+    source = df[col].iloc[start:stop]
+    frame = func(pd.DataFrame({col: source}, copy=False), [col], *args, **kwargs)
+
+    return _changed_columns(frame, col, source.to_numpy())
+
+
+def _share_column(series, blocks):
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in 'biufcmM' or len(series) == 0:
+        return ('pickle', series.reset_index(drop=True))
+
+    values = series.to_numpy()
+    block = shared_memory.SharedMemory(create=True, size=values.nbytes)
+    blocks[block.name] = block
+    np.ndarray(values.shape, dtype=dtype, buffer=block.buf)[:] = values
+
+    return ('shared', block.name, dtype.str, len(values))
+
+
+def _slice_spec(spec, start, stop):
+    # pickled columns are cut to the task's rows so each row range is sent once, not the whole column
+    if spec[0] == 'pickle':
+        return ('pickle', spec[1].iloc[start:stop])
+
+    return spec
+
+
+def _process_task(func, col, spec, start, stop, args, kwargs):
+    if spec[0] == 'pickle':
+        source = spec[1]
+        frame = func(pd.DataFrame({col: source}, copy=False), [col], *args, **kwargs)
+        return _changed_columns(frame, col, source.to_numpy(), copy=False)
+
+    _, name, dtype, length = spec
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        values = np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf)[start:stop]
+        source = pd.Series(values, index=pd.RangeIndex(start, stop), name=col, copy=False)
+        frame = func(pd.DataFrame({col: source}, copy=False), [col], *args, **kwargs)
+        # results are copied out so no view of the shared buffer outlives it
+        result = _changed_columns(frame, col, values, copy=True)
+        del values, source, frame
+    finally:
+        block.close()
+
+    return result
+
+
+def _changed_columns(frame, col, source, copy=False):
+    result = {}
+    for name in frame.columns:
+        series = frame[name]
+        if name == col and np.shares_memory(series.to_numpy(), source):
+            continue
+        result[name] = series.copy() if copy else series
+
+    return result
@@ -0,0 +1,129 @@
+import pandas as pd
+
+from .correct import cols_to_drop, cols_to_rename
+
+
+class Pipeline:
+    """Record a sequence of transform steps and execute them together.
+
+    Steps are any of the convert, correct and create functions taking a dataframe
+    as their first argument. Instead of assigning into the full dataframe after every
+    step, each step runs against a narrow frame holding only the columns it reads, and
+    the working columns are carried from step to step. The full dataframe is assembled
+    once at the end, so columns dropped along the way are never materialized in it.
+
+    Example:
+        pipe = (Pipeline()
+                .add(cols_to_strip_commas, ['price'])
+                .add(cols_to_float, ['price'])
+                .add(cols_to_log1p, ['price'])
+                .add(cols_to_drop, ['price']))
+        df = pipe.run(df)
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    def add(self, func, *args, inputs=None, **kwargs):
+        """Append a step and return the pipeline.
+
+        Consecutive steps calling the same function with a list of columns are fused
+        into a single step over the combined column list.
+
+        Args:
+            func: Transform function, i.e. cols_to_float.
+            args: Arguments passed to func after the dataframe.
+            inputs: Optional list of columns func reads. Inferred from args when omitted.
+            kwargs: Keyword arguments passed to func.
+
+        Returns:
+            The pipeline, so calls can be chained.
+        """
+
+        if self.steps and inputs is None and not kwargs and _is_column_list_step(args):
+            last_func, last_args, last_inputs, last_kwargs = self.steps[-1]
+            if last_func is func and last_inputs is None and not last_kwargs and _is_column_list_step(last_args):
+                self.steps[-1] = (func, (list(last_args[0]) + list(args[0]),), None, {})
+                return self
+
+        self.steps.append((func, args, inputs, kwargs))
+        return self
+
+    def run(self, df):
+        """Execute all recorded steps and return a new dataframe.
+
+        Args:
+            df: Pandas dataframe.
+
+        Returns:
+            New dataframe with the source columns, in place conversions and new columns.
+        """
+
+        order = list(df.columns)
+        work = {}
+
+        for func, args, inputs, kwargs in self.steps:
+            if func is cols_to_drop:
+                for col in args[0]:
+                    order.remove(col)
+                    work.pop(col, None)
+                continue
+
+            if func is cols_to_rename:
+                for old, new in args[0].items():
+                    order[order.index(old)] = new
+                    if old in work:
+                        work[new] = work.pop(old)
+                    else:
+                        work[new] = df[old]
+                continue
+
+            if inputs is None:
+                inputs = _infer_inputs(args, kwargs, order)
+
+            frame = pd.DataFrame({col: work[col] if col in work else df[col] for col in inputs},
+                                 index=df.index, copy=False)
+            frame = func(frame, *args, **kwargs)
+
+            for col in inputs:
+                if col not in frame.columns:
+                    order.remove(col)
+                    work.pop(col, None)
+
+            for col in frame.columns:
+                if col not in order:
+                    order.append(col)
+                work[col] = frame[col]
+
+        if not order:
+            return pd.DataFrame(index=df.index)
+
+        result = pd.concat([work[col] if col in work else df[col] for col in order], axis=1)
+        result.columns = order
+
+        return result
+
+    __call__ = run
+
+
+def _is_column_list_step(args):
+    return len(args) == 1 and isinstance(args[0], list)
+
+
+def _infer_inputs(args, kwargs, known):
+    names = []
+    for arg in list(args) + list(kwargs.values()):
+        if isinstance(arg, str):
+            candidates = [arg]
+        elif isinstance(arg, dict):
+            candidates = list(arg.keys())
+        elif isinstance(arg, (list, tuple)):
+            candidates = list(arg)
+        else:
+            continue
+
+        for name in candidates:
+            if isinstance(name, str) and name in known and name not in names:
+                names.append(name)
+
+    return names
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import cache, convert, correct, create
+
+
+def make_frame():
+    return pd.DataFrame({
+        'a': [1., 2., 3., 4.],
+        'g': ['x', 'y', 'x', 'x'],
+        'd': pd.date_range('2020-01-01', periods=4, tz='UTC'),
+    }, index=[5, 6, 7, 8])
+
+
+CALLS = [
+    (create.cols_to_normalize, (['a'],), {}),
+    (create.cols_to_normalize, (['a'],), {'inplace': False}),
+    (create.cols_to_one_hot, (['g'],), {'sparse': True}),
+    (create.get_grouped_stats, ('g', 'a'), {'stats': ['sum']}),
+    (create.get_date_features, (['d'],), {'features': ['day_name', 'month']}),
+    (convert.cols_to_category, (['g'],), {'max_unique_ratio': 1}),
+    (convert.cols_to_negative, (['a'],), {'inplace': False}),
+    (correct.cols_to_drop, (['g'],), {}),
+    (correct.cols_to_rename, ({'a': 'b'},), {}),
+]
+
+
+@pytest.mark.parametrize('func, args, kwargs', CALLS, ids=[func.__name__ for func, _, _ in CALLS])
+def test_hit_matches_miss(func, args, kwargs):
+    transform_cache = cache.TransformCache()
+    results = []
+    for _ in range(2):
+        df = make_frame()
+        result = transform_cache.call(func, df, *args, **kwargs)
+        results.append((result, result is df, df))
+
+    (miss, miss_same, miss_input), (hit, hit_same, hit_input) = results
+    pd.testing.assert_frame_equal(hit, miss)
+    assert hit_same == miss_same
+    pd.testing.assert_frame_equal(hit_input, miss_input)
+
+
+def test_hit_is_counted_and_keeps_dtypes():
+    transform_cache = cache.TransformCache()
+    transform_cache.call(convert.cols_to_category, make_frame(), ['g'], max_unique_ratio=1)
+    result = transform_cache.call(convert.cols_to_category, make_frame(), ['g'], max_unique_ratio=1)
+
+    assert transform_cache.stats()['hits'] == 1
+    assert isinstance(result['g'].dtype, pd.CategoricalDtype)
+
+
+def test_column_removing_results_are_not_cached():
+    transform_cache = cache.TransformCache()
+    for _ in range(2):
+        transform_cache.call(correct.cols_to_drop, make_frame(), ['g'])
+
+    assert transform_cache.stats()['hits'] == 0
+
+
+def test_bound_methods_of_different_fits_do_not_collide():
+    transform_cache = cache.TransformCache()
+    wide = create.Scaler().fit(pd.DataFrame({'a': [0., 10.]}), ['a'])
+    narrow = create.Scaler().fit(pd.DataFrame({'a': [0., 4.]}), ['a'])
+
+    first = transform_cache.call(wide.transform, make_frame(), ['a'])['norm_a']
+    second = transform_cache.call(narrow.transform, make_frame(), ['a'])['norm_a']
+
+    assert not np.allclose(first, second)
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from .. import convert
+
+
+@pytest.mark.parametrize('values, failed', [
+    (['2020-01-01', '2020-01-02', '2020-01-03T10:00:00Z'], [2]),
+    (['2020-01-01', '2020-01-02', '2020-01-03 10:00:00.123456789'], []),
+    (['2020-01-01T00:00:00Z', '2020-01-01T00:00:00+01:00'], [0, 1]),
+    (['2020-01-01', '2020-01-02', 'bad', None], [2]),
+])
+def test_cols_to_datetime_coerce_never_raises(values, failed):
+    df = convert.cols_to_datetime(pd.DataFrame({'d': values}), ['d'], errors='coerce')
+    parsed, failed_rows = convert.parse_datetime(pd.Series(values))
+
+    assert pd.api.types.is_datetime64_any_dtype(df['d'].dtype)
+    assert list(failed_rows) == failed
+    assert df['d'].isna().sum() == len(failed) + sum(value is None for value in values)
+
+
+def test_parse_datetime_keeps_fallback_precision():
+    parsed, _ = convert.parse_datetime(pd.Series(['2020-01-01', '2020-01-02', '2020-01-03 10:00:00.123456789']))
+
+    assert parsed[2] == pd.Timestamp('2020-01-03 10:00:00.123456789')
+
+
+def test_cols_to_numeric_parses_dirty_strings_as_float64():
+    df = convert.cols_to_numeric(pd.DataFrame({'p': [' $1,200 ', '(5)', '12.5%', 'n/a']}), ['p'])
+
+    assert df['p'].dtype == 'float64'
+    assert df['p'].tolist()[:3] == [1200.0, -5.0, 0.125]
+    assert pd.isna(df['p'][3])
+
+
+def test_cols_to_numeric_downcast_stays_signed():
+    df = convert.cols_to_numeric(pd.DataFrame({'p': ['100', '200']}), ['p'], downcast=True)
+
+    assert df['p'].dtype.kind == 'i'
+    assert (df['p'] + df['p']).tolist() == [200, 400]
+    assert (df['p'] - 150).tolist() == [-50, 50]
+    assert convert.cols_to_negative(df, ['p'])['p'].tolist() == [-100, -200]
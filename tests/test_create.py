@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import create
+
+
+def percentiles(values, **kwargs):
+    df = pd.DataFrame({'v': values})
+
+    return create.cols_to_percentile(df, ['v'], **kwargs)['pc_lin_v'].to_numpy()
+
+
+@pytest.mark.parametrize('values', [
+    np.array([1., 2., 3.]),
+    np.random.default_rng(0).choice([0., 1., 5.], 10000, p=[.6, .3, .1]),
+    np.random.default_rng(1).integers(0, 50, 20000).astype(float),
+    np.r_[np.random.default_rng(2).normal(size=20000), np.zeros(500), np.nan],
+])
+def test_approximate_percentile_matches_exact_on_ties(values):
+    exact = percentiles(values)
+    approximate = percentiles(values, approximate=True)
+
+    np.testing.assert_allclose(approximate, exact, atol=0.005)
+    assert approximate[np.nanargmin(values)] == 0
+
+
+def test_approximate_percentile_streamed_fit():
+    values = np.random.default_rng(3).choice([0., 1., 5.], 9000, p=[.6, .3, .1])
+    scaler = create.PercentileScaler()
+    for chunk in np.array_split(values, 7):
+        scaler.partial_fit(pd.DataFrame({'v': chunk}), ['v'])
+
+    result = scaler.transform(pd.DataFrame({'v': values}))['pc_lin_v'].to_numpy()
+
+    np.testing.assert_allclose(result, percentiles(values), atol=1e-9)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import convert, correct, create
+
+
+def make_frame():
+    rows = 60
+    return pd.DataFrame({
+        'num': np.arange(1., rows + 1),
+        'int': np.arange(rows),
+        'text': ['1,200 a'] * 30 + ['x'] * 30,
+        'group': ['k{}'.format(i % 3) for i in range(rows)],
+        'date': pd.date_range('2020-01-01', periods=rows),
+        'date_text': ['2020-01-{:02d}'.format(i % 28 + 1) for i in range(rows)],
+        'untouched': np.linspace(0, 1, rows),
+    })
+
+
+def window_transform(df, inplace=True):
+    return create.WindowFeatures('group', 'num', lags=[1], rolling={2: ['mean']}).transform(df, inplace=inplace)
+
+
+def window_partial_transform(df, inplace=True):
+    return create.WindowFeatures('group', 'num', expanding=['sum']).partial_transform(df, inplace=inplace)
+
+
+def fitted_transform(encoder, columns):
+    def transform(df, inplace=True):
+        return encoder.fit(df, columns).transform(df, columns, inplace=inplace)
+
+    return transform
+
+
+TRANSFORMS = [
+    (convert.cols_to_slugify, (['text'],), {}),
+    (convert.cols_to_clean_strings, (['text'], [(',', '')]), {}),
+    (convert.cols_to_float, (['int'],), {}),
+    (convert.cols_to_int, (['num'],), {}),
+    (convert.cols_to_numeric, (['text'],), {}),
+    (convert.cols_to_datetime, (['date_text'],), {}),
+    (convert.cols_to_negative, (['num'],), {}),
+    (convert.cols_to_downcast, (['int'],), {}),
+    (convert.cols_to_category, (['group'],), {}),
+    (convert.optimize_memory, (['int', 'group'],), {}),
+    (convert.num_to_Cat, ('num', ['low', 'high'], [0, 30, 100]), {}),
+    (convert.cols_to_bins, ({'num': 3},), {}),
+    (convert.cat_to_cat, ('group', {'k0': 'zero'}), {}),
+    (convert.cols_to_map, ({'group': {'k0': 'zero'}},), {}),
+    (correct.cols_to_strip_commas, (['text'],), {}),
+    (correct.cols_to_drop, (['text'],), {}),
+    (correct.cols_to_rename, ({'text': 'renamed'},), {}),
+    (create.cols_to_log, (['num'],), {}),
+    (create.cols_to_log1p, (['num'],), {}),
+    (create.cols_to_log_max_root, (['num'],), {}),
+    (create.cols_to_tanh, (['num'],), {}),
+    (create.cols_to_sigmoid, (['num'],), {}),
+    (create.cols_to_cube_root, (['num'],), {}),
+    (create.cols_to_cube_root_normalize, (['num'],), {}),
+    (create.cols_to_percentile, (['num'],), {}),
+    (create.cols_to_percentile, (['num'],), {'approximate': True}),
+    (create.cols_to_normalize, (['num'],), {}),
+    (create.cols_to_log1p_normalize, (['num'],), {}),
+    (create.cols_to_one_hot, (['group'],), {}),
+    (create.cols_to_one_hot, (['group'],), {'sparse': True}),
+    (create.cols_to_reduce_uniques, ({'group': 10},), {}),
+    (create.get_grouped_stats, ('group', 'num'), {}),
+    (create.get_previous_value, ('group', 'num', 'previous'), {}),
+    (create.get_dates, ('date',), {}),
+    (create.get_date_features, (['date'],), {}),
+    (fitted_transform(create.Scaler(), ['num']), (), {}),
+    (fitted_transform(create.PercentileScaler(), ['num']), (), {}),
+    (fitted_transform(create.OneHotEncoder(), ['group']), (), {}),
+    (fitted_transform(create.Reducer(threshold=10), ['group']), (), {}),
+    (window_transform, (), {}),
+    (window_partial_transform, (), {}),
+]
+
+IDS = ['{}-{}'.format(i, getattr(func, '__name__', 'transform')) for i, (func, _, _) in enumerate(TRANSFORMS)]
+
+
+def run(func, args, kwargs, df, **options):
+    result = func(df, *args, **kwargs, **options)
+
+    return result[0] if isinstance(result, tuple) else result
+
+
+@pytest.mark.parametrize('func, args, kwargs', TRANSFORMS, ids=IDS)
+def test_inplace_returns_input_and_keeps_buffers(func, args, kwargs):
+    df = make_frame()
+    untouched = df['untouched'].to_numpy()
+
+    result = run(func, args, kwargs, df)
+
+    assert result is df
+    assert np.shares_memory(df['untouched'].to_numpy(), untouched)
+
+
+@pytest.mark.parametrize('func, args, kwargs', TRANSFORMS, ids=IDS)
+def test_copy_leaves_input_unchanged_and_shares_buffers(func, args, kwargs):
+    df = make_frame()
+    before = df.copy()
+    untouched = df['untouched'].to_numpy()
+
+    result = run(func, args, kwargs, df, inplace=False)
+
+    assert result is not df
+    pd.testing.assert_frame_equal(df, before)
+    assert np.shares_memory(result['untouched'].to_numpy(), untouched)
+    pd.testing.assert_frame_equal(result, run(func, args, kwargs, make_frame()))
+
+
+def test_col_names_to_lower_leaves_input_unchanged():
+    df = pd.DataFrame({'Name': [1], 'AGE': [2]})
+
+    names = correct.col_names_to_lower(df)
+
+    assert list(names) == ['name', 'age']
+    assert list(df.columns) == ['Name', 'AGE']
@@ -0,0 +1,23 @@
+import pandas as pd
+import pytest
+
+from .. import convert, parallel
+
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_parallel_apply_matches_serial(backend):
+    df = pd.DataFrame({'s': ['a b,{}'.format(i % 7) for i in range(1000)], 'n': range(1000)})
+    expected = convert.cols_to_slugify(df.copy(), ['s'])
+
+    result = parallel.parallel_apply(df.copy(), convert.cols_to_slugify, ['s'], backend=backend,
+                                     workers=2, row_chunks=4)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_pickled_columns_are_sliced_per_task():
+    spec = parallel._share_column(pd.Series(['x'] * 100), {})
+    sliced = parallel._slice_spec(spec, 25, 50)
+
+    assert sliced[0] == 'pickle'
+    assert list(sliced[1].index) == list(range(25, 50))
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from .. import util
+
+
+VALUES = ['19900101', '2020-01-01', '２０２００１０１', '1990010²', 'john smith', 'John Smith', 'ß', 'ﬁsh', 'ΣΑΣ',
+          'ǅungla', 'ǆungla', "o'neil", 'Bob Jr.', 'Al Smith, III', 'Ann Esq', 'no spaces', 'İstanbul', '']
+
+# the title case validator is shadowed by the normaliser of the same name, str.istitle is what it did
+PAIRS = [
+    (util.valid_date_format, util.col_valid_date_format),
+    (util.no_spaces, util.col_no_spaces),
+    (str.istitle, util.col_is_title_case),
+    (util.normalize_date, util.col_normalize_date),
+    (util.remove_spaces, util.col_remove_spaces),
+    (util.title_case, util.col_to_title_case),
+    (util.remove_suffix, util.col_remove_suffix),
+]
+
+
+@pytest.mark.parametrize('dtype', [object, 'str'])
+@pytest.mark.parametrize('scalar, column', PAIRS, ids=[column.__name__ for _, column in PAIRS])
+def test_column_versions_match_scalar_versions(scalar, column, dtype):
+    series = pd.Series(VALUES, dtype=dtype)
+
+    assert column(series).tolist() == [scalar(value) for value in VALUES]
+
+
+@pytest.mark.parametrize('dtype', [object, 'str'])
+def test_col_is_greater_than_matches_scalar(dtype):
+    series = pd.Series(VALUES, dtype=dtype)
+
+    assert util.col_is_greater_than(series, 8).tolist() == [util.is_greater_than(value, 8) for value in VALUES]
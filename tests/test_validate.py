@@ -0,0 +1,13 @@
+import io
+
+import pandas as pd
+
+from .. import validate
+
+
+def test_string_rules_accept_columns_read_as_numbers():
+    df = pd.read_csv(io.StringIO('dob,name\n19900101,a\n,b\n3000000,c\n'))
+    report = validate.Validator({'dob': {'date_format': True, 'max_length': 8}}).validate(df)
+
+    assert report.set_index('rule')['violations'].to_dict() == {'date_format': 1, 'max_length': 0}
+    assert report.set_index('rule').loc['date_format', 'sample_rows'] == [2]
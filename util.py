@@ -1,3 +1,6 @@
+import numpy as np
+import pandas as pd
+
 
 #General functions
 
@@ -198,6 +201,121 @@ def remove_suffix(string):
                           string = string[:-len(suffix)]
                           return(string)
           return(string)
-      
+
+
+#Vectorized column versions of the validation and normalisation functions above
+
+_SUFFIXES = ["Esq", "Ii", "Iii", "Iiii", "Iv", "Jnr", "Jr", "Sr"]
+
+
+def _to_mask(result):
+    return result.fillna(False).astype(bool)
+
+
+def _map_distinct(series, func):
+    # Python str methods on the distinct values, Arrow backed strings change the case of some characters differently
+    codes, uniques = pd.factorize(series)
+    values = [func(value) if isinstance(value, str) else np.nan for value in uniques]
+    return pd.Series(np.append(np.array(values, dtype=object), np.nan).take(codes), index=series.index)
+
+
+def col_valid_date_format(series):
+    """Column version of valid_date_format
+
+    Args:
+        series: Pandas Series of str
+    Returns:
+        returns boolean Series, missing values are False
+    """
+    mask = series.str.len().eq(8) & _to_mask(series.str.isdigit()) & _to_mask(series.str[:1].isin(["1", "2"]))
+    return mask
+
+
+def col_no_spaces(series):
+    """Column version of no_spaces
+
+    Args:
+        series: Pandas Series of str
+    Returns:
+        returns boolean Series, missing values are False
+    """
+    return ~_to_mask(series.str.contains(" ", regex=False)) & series.notna()
+
+
+def col_is_title_case(series):
+    """Column version of the title case validator, True when a string is title case
+
+    Args:
+        series: Pandas Series of str
+    Returns:
+        returns boolean Series, missing values are False
+    """
+    return _to_mask(series.str.istitle())
+
+
+def col_is_greater_than(series, notgreaterthanthis):
+    """Column version of is_greater_than, True when the length is not greater than notgreaterthanthis
+
+    Args:
+        series: Pandas Series of str
+        notgreaterthanthis: int
+    Returns:
+        returns boolean Series, missing values are False
+    """
+    return series.str.len().le(notgreaterthanthis)
+
+
+def col_normalize_date(series):
+    """Column version of normalize_date, removes non digits and joins numbers together
+
+    Args:
+        series: Pandas Series of str
+    Returns:
+        returns Series of str
+    """
+    return series.str.replace("[^0-9]", "", regex=True)
+
+
+def col_remove_spaces(series):
+    """Column version of remove_spaces
+
+    Args:
+        series: Pandas Series of str
+    Returns:
+        returns Series of str
+    """
+    return series.str.replace(" ", "", regex=False)
+
+
+def col_to_title_case(series):
+    """Column version of the title case normaliser, makes strings title case
+
+    Args:
+        series: Pandas Series of str
+    Returns:
+        returns Series of str
+    """
+    result = _map_distinct(series, lambda value: value.lower().title())
+    return result.astype(series.dtype) if isinstance(series.dtype, pd.StringDtype) else result
+
+
+def col_remove_suffix(series):
+    """Column version of remove_suffix, only the first matching suffix in list order is removed
+
+    Args:
+        series: Pandas Series of str
+    Returns:
+        returns Series of str
+    """
+    cleaned = series.str.replace(" ", "", regex=False).str.replace(".", "", regex=False).str.replace(",", "", regex=False)
+    result = cleaned.copy()
+    done = pd.Series(False, index=series.index)
+    for suffix in _SUFFIXES:
+        matched = ~done & _to_mask(cleaned.str.endswith(suffix))
+        result[matched] = cleaned[matched].str[:-len(suffix)]
+        done |= matched
+    return result
+
+
 def print_hi():
     print("Hiyaa")      
@@ -0,0 +1,135 @@
+import pandas as pd
+
+from .util import col_valid_date_format, col_no_spaces, col_is_title_case, col_is_greater_than
+
+
+_ROW_RULES = {
+    'date_format': lambda series, arg: col_valid_date_format(series),
+    'no_spaces': lambda series, arg: col_no_spaces(series),
+    'title_case': lambda series, arg: col_is_title_case(series),
+    'max_length': col_is_greater_than,
+}
+
+
+def _as_strings(series):
+    # string rules judge the text of the values, i.e. a dob column read by read_csv as numbers
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        return series
+    if pd.api.types.is_float_dtype(series.dtype):
+        values = series.dropna()
+        if (values == values.round()).all():
+            series = series.astype('Int64')
+
+    return series.astype(str).where(series.notna())
+
+
+class Validator:
+    """Evaluate a declared schema of column checks and report violations per rule.
+
+    The schema maps column names to rules. Supported rules are max_null_ratio (fraction of
+    missing rows allowed), date_format, no_spaces, title_case (enabled with True), max_length
+    (maximum string length) and custom callables taking a Series and returning a boolean mask
+    of valid rows. Row rules only judge non-missing values, missing values are covered by
+    max_null_ratio. Columns that are not strings, i.e. dates read as numbers, are checked as
+    their string form, with whole floats written without decimals. Results accumulate across calls to update, so large files can be checked
+    chunk by chunk.
+
+    Args:
+        schema: Dictionary of column and rules, i.e. {'full_name': {'max_null_ratio': .1, 'title_case': True}}
+        samples: Number of violating row indices kept per rule.
+
+    Example:
+        validator = Validator({'dob': {'date_format': True, 'max_null_ratio': 0}})
+        for chunk in read_csv(file, chunksize=100000):
+            validator.update(chunk)
+        report = validator.report()
+    """
+
+    def __init__(self, schema, samples=5):
+        for column, rules in schema.items():
+            for rule, arg in rules.items():
+                if rule != 'max_null_ratio' and rule not in _ROW_RULES and not callable(arg):
+                    raise ValueError('Unknown rule {} for column {}'.format(rule, column))
+
+        self.schema = schema
+        self.samples = samples
+        self.reset()
+
+    def reset(self):
+        """Clear accumulated results."""
+
+        self.rows = 0
+        self._results = {}
+        for column, rules in self.schema.items():
+            for rule in rules:
+                self._results[(column, rule)] = {'violations': 0, 'sample_rows': []}
+
+    def update(self, df):
+        """Evaluate all rules against a dataframe or chunk and accumulate the results.
+
+        Args:
+            df: Pandas dataframe.
+
+        Returns:
+            The validator.
+        """
+
+        self.rows += len(df)
+        for column, rules in self.schema.items():
+            series = df[column]
+            present = series.notna()
+            for rule, arg in rules.items():
+                if rule == 'max_null_ratio':
+                    invalid = ~present
+                elif callable(arg):
+                    invalid = ~arg(series).fillna(False).astype(bool) & present
+                elif arg is False:
+                    continue
+                else:
+                    invalid = ~_ROW_RULES[rule](_as_strings(series), arg) & present
+
+                result = self._results[(column, rule)]
+                result['violations'] += int(invalid.sum())
+                missing = self.samples - len(result['sample_rows'])
+                if missing > 0:
+                    result['sample_rows'].extend(df.index[invalid.to_numpy()][:missing].tolist())
+
+        return self
+
+    def validate(self, df):
+        """Evaluate all rules against a single dataframe and return the report.
+
+        Args:
+            df: Pandas dataframe.
+
+        Returns:
+            Report dataframe, see report.
+        """
+
+        self.reset()
+        return self.update(df).report()
+
+    def report(self):
+        """Return the accumulated violation report.
+
+        Returns:
+            Dataframe with one row per column and rule containing rows checked, violation count,
+            violation ratio, passed flag and sample row indices.
+        """
+
+        records = []
+        for (column, rule), result in self._results.items():
+            ratio = result['violations'] / self.rows if self.rows else 0.0
+            threshold = self.schema[column][rule]
+            passed = ratio <= threshold if rule == 'max_null_ratio' else result['violations'] == 0
+            records.append({
+                'column': column,
+                'rule': rule,
+                'rows': self.rows,
+                'violations': result['violations'],
+                'ratio': ratio,
+                'passed': passed,
+                'sample_rows': list(result['sample_rows']),
+            })
+
+        return pd.DataFrame(records, columns=['column', 'rule', 'rows', 'violations', 'ratio', 'passed', 'sample_rows'])